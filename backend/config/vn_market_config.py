@@ -130,10 +130,18 @@ class VNMarketConfig:
     RISK_FREE_PROXIES = {
         "government_bond_10y": 0.04,  # 10-year government bond
         "government_bond_5y": 0.038,  # 5-year government bond
+        "government_bond_1y": 0.036,  # 1-year government bond (warrant tenors)
         "interbank_rate": 0.045,      # Interbank rate
         "vnx30_futures_basis": 0.042  # VN30 futures implied rate
     }
     
+    # Government bond proxies by tenor (years), for a term structure of risk-free rates
+    RISK_FREE_TENORS = {
+        1.0: "government_bond_1y",
+        5.0: "government_bond_5y",
+        10.0: "government_bond_10y"
+    }
+    
     # Volatility Benchmarks
     VOLATILITY_BENCHMARKS = {
         "vn30_historical": 0.15,      # VN30 historical volatility
@@ -182,6 +190,12 @@ class VNMarketConfig:
     def get_risk_free_rate(cls, proxy: str = "government_bond_10y") -> float:
         """Get risk-free rate for options pricing"""
         return cls.RISK_FREE_PROXIES.get(proxy, 0.04)
+    
+    @classmethod
+    def get_risk_free_curve(cls) -> tuple:
+        """Get (tenors, rates) of the risk-free term structure, sorted by tenor"""
+        tenors = sorted(cls.RISK_FREE_TENORS)
+        return tenors, [cls.RISK_FREE_PROXIES[cls.RISK_FREE_TENORS[t]] for t in tenors]
 
 # Export configuration instance
 vn_market_config = VNMarketConfig() 
\ No newline at end of file
@@ -5,15 +5,25 @@ Successfully handles all 283+ Vietnamese warrants
 """
 
 import asyncio
+import csv
+import functools
+import json
 import logging
+import math
+import multiprocessing
+import os
 import re
 import time
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ProcessPoolExecutor
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any, Tuple, TextIO
 from datetime import datetime, date
+import numpy as np
 import pandas as pd
 
 import requests
-from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
 from vnstock import Listing, Quote, Company
 
 from ...config.settings import settings
@@ -24,6 +34,277 @@ from ...models.warrant_models import (
 
 logger = logging.getLogger(__name__)
 
+# Vietstock renders the CW overview inside this container; the nav/footer
+# subtrees around it are never queried.
+_DETAIL_CONTAINER_XPATH = '//div[@id="cw-tong-quan"]'
+
+# Only tables that mention the strike are scanned for label/value rows
+_STRIKE_TABLES_XPATH = lxml.etree.XPath(
+    './/table[.//text()[contains(., "thực hiện") or contains(., "Strike")]]'
+)
+
+# Fast path: (field, UTF-8 label, value pattern) located with plain bytes.find,
+# searching only from the start of the overview container
+_FAST_PATH_CONTAINER = b'id="cw-tong-quan"'
+_FAST_PATH_FIELDS = [
+    ('strike_price', 'Giá thực hiện'.encode('utf-8'), re.compile(rb'[0-9,]+')),
+    ('expiration_date', 'Ngày đáo hạn'.encode('utf-8'), re.compile(rb'[0-9/]+')),
+    ('conversion_ratio', 'Tỷ lệ chuyển đổi'.encode('utf-8'), re.compile(rb'[0-9:.]+')),
+    ('issue_price', 'Giá phát hành'.encode('utf-8'), re.compile(rb'[0-9,]+')),
+    ('underlying_stock', 'CK cơ sở'.encode('utf-8'), re.compile(rb'[A-Z]+')),
+    ('issuer', 'Tổ chức phát hành CW'.encode('utf-8'), re.compile(rb'.+')),
+    ('current_price', 'Giá hiện tại'.encode('utf-8'), re.compile(rb'[0-9,]+')),
+    ('trading_status', 'Trạng thái'.encode('utf-8'),
+     re.compile('Ngừng giao dịch|Đang giao dịch|Suspended|Active|Trading'.encode('utf-8'), re.IGNORECASE)),
+]
+_FAST_PATH_REQUIRED = ('strike_price', 'expiration_date', 'underlying_stock',
+                       'current_price', 'trading_status')
+_FAST_PATH_WINDOW = 400  # max bytes scanned past a label for its value
+
+
+def _scan_value(html: bytes, start: int, end: int) -> Optional[bytes]:
+    """Return the first text run in html[start:end], skipping tags and ':' separators"""
+    i = start
+    while i < end:
+        ch = html[i]
+        if ch == 0x3C:  # '<'
+            i = html.find(b'>', i, end)
+            if i < 0:
+                return None
+            i += 1
+        elif ch in b' \t\r\n:':
+            i += 1
+        else:
+            stop = html.find(b'<', i, end)
+            if stop < 0:
+                stop = end
+            newline = html.find(b'\n', i, stop)
+            if newline >= 0:
+                stop = newline
+            return html[i:stop].strip()
+    return None
+
+
+def _fast_parse(html_content: bytes, symbol: str) -> Optional[Dict[str, Any]]:
+    """
+    Extract warrant details straight from the raw HTML with bytes.find
+    
+    Args:
+        html_content: Raw UTF-8 HTML bytes from Vietstock
+        symbol: Warrant symbol
+        
+    Returns:
+        Dictionary with parsed warrant details, or None if any required
+        field is missing (caller falls back to full lxml parsing)
+    """
+    container = html_content.find(_FAST_PATH_CONTAINER)
+    if container < 0:
+        return None
+    
+    warrant_info = {'symbol': symbol}
+    
+    for field, label, value_re in _FAST_PATH_FIELDS:
+        warrant_info[field] = None
+        pos = html_content.find(label, container)
+        while pos >= 0:
+            start = pos + len(label)
+            value = _scan_value(html_content, start, min(start + _FAST_PATH_WINDOW, len(html_content)))
+            match = value_re.match(value) if value else None
+            if match:
+                warrant_info[field] = match.group(0).decode('utf-8', 'replace').strip() or None
+                break
+            pos = html_content.find(label, start)
+    
+    if not all(warrant_info[field] for field in _FAST_PATH_REQUIRED):
+        return None
+    
+    return warrant_info
+
+
+def _parse_warrant_details_from_vietstock(html_content: bytes, symbol: str,
+                                      encoding: str = 'utf-8') -> Dict[str, Any]:
+    """
+    Parse warrant details from Vietstock HTML content
+    Enhanced parsing with multiple fallback patterns
+    
+    Args:
+        html_content: Raw HTML bytes from Vietstock
+        symbol: Warrant symbol
+        encoding: Declared response encoding (skips charset detection)
+        
+    Returns:
+        Dictionary with parsed warrant details
+    """
+    warrant_info = _fast_parse(html_content, symbol)
+    if warrant_info is not None:
+        return warrant_info
+    
+    document = lxml.html.fromstring(html_content, parser=lxml.html.HTMLParser(encoding=encoding))
+    containers = document.xpath(_DETAIL_CONTAINER_XPATH)
+    root = containers[0] if containers else document
+    text = root.text_content()
+    
+    if not text.strip():
+        # Container empty (layout change) - fall back to the full document
+        root = document
+        text = root.text_content()
+    
+    # Enhanced regex patterns with multiple alternatives
+    parsing_patterns = {
+        'strike_price': [
+            r'Giá thực hiện[:\s]*([0-9,]+)',
+            r'thực hiện[:\s]*([0-9,]+)', 
+            r'Strike[:\s]*([0-9,]+)',
+            r'Exercise price[:\s]*([0-9,]+)'
+        ],
+        'expiration_date': [
+            r'Ngày đáo hạn[:\s]*([0-9/]+)',
+            r'đáo hạn[:\s]*([0-9/]+)',
+            r'Expiration[:\s]*([0-9/]+)',
+            r'Maturity[:\s]*([0-9/]+)'
+        ],
+        'conversion_ratio': [
+            r'Tỷ lệ chuyển đổi[:\s]*([0-9:.]+)',
+            r'chuyển đổi[:\s]*([0-9:.]+)',
+            r'Conversion[:\s]*([0-9:.]+)',
+            r'Ratio[:\s]*([0-9:.]+)'
+        ],
+        'issue_price': [
+            r'Giá phát hành[:\s]*([0-9,]+)',
+            r'phát hành[:\s]*([0-9,]+)',
+            r'Issue price[:\s]*([0-9,]+)',
+            r'Initial price[:\s]*([0-9,]+)'
+        ],
+        'underlying_stock': [
+            r'CK cơ sở[:\s]*([A-Z]+)',
+            r'cơ sở[:\s]*([A-Z]+)',
+            r'Underlying[:\s]*([A-Z]+)',
+            r'Base stock[:\s]*([A-Z]+)'
+        ],
+        'issuer': [
+            r'Tổ chức phát hành CW[:\s]*([^\\n]+)',
+            r'phát hành CW[:\s]*([^\\n]+)',
+            r'Issuer[:\s]*([^\\n]+)',
+            r'Issued by[:\s]*([^\\n]+)'
+        ],
+        'current_price': [
+            r'([0-9,]+)\s*[+-]?[0-9,]*\s*\([+-]?[0-9.]+%\)',
+            r'Giá hiện tại[:\s]*([0-9,]+)',
+            r'Current[:\s]*([0-9,]+)'
+        ],
+        'trading_status': [
+            r'(Ngừng giao dịch|Đang giao dịch|Suspended|Active|Trading)',
+            r'Trạng thái[:\s]*([^\\n]+)',
+            r'Status[:\s]*([^\\n]+)'
+        ]
+    }
+    
+    # Extract information using multiple patterns
+    warrant_info = {'symbol': symbol}
+    
+    for field, patterns in parsing_patterns.items():
+        value_found = False
+        
+        for pattern in patterns:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                warrant_info[field] = match.group(1).strip() or None
+                value_found = True
+                break
+        
+        if not value_found:
+            warrant_info[field] = None
+    
+    # Additional data extraction from tables
+    for table in _STRIKE_TABLES_XPATH(root):
+        for row in table.iter('tr'):
+            cells = row.xpath('./td|./th')
+            if len(cells) >= 2:
+                label = cells[0].text_content().strip()
+                value = cells[1].text_content().strip()
+                
+                # Map table data to our fields
+                if 'thực hiện' in label and not warrant_info.get('strike_price'):
+                    strike_match = re.search(r'([0-9,]+)', value)
+                    if strike_match:
+                        warrant_info['strike_price'] = strike_match.group(1)
+                
+                elif 'đáo hạn' in label and not warrant_info.get('expiration_date'):
+                    date_match = re.search(r'([0-9/]+)', value)
+                    if date_match:
+                        warrant_info['expiration_date'] = date_match.group(1)
+    
+    return warrant_info
+
+
+class _LRUCache:
+    """Size-bounded LRU cache with optional per-entry TTL (seconds)"""
+    
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: 'OrderedDict[Any, Tuple[Any, float]]' = OrderedDict()
+    
+    def get(self, key: Any, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        value, stored_at = entry
+        if self.ttl is not None and time.monotonic() - stored_at > self.ttl:
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+    
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._data[key] = (value, time.monotonic())
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+    
+    def __contains__(self, key: Any) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
+    
+    def clear(self) -> None:
+        self._data.clear()
+
+
+_MISSING = object()
+
+_SQRT_252 = math.sqrt(252)
+
+# Symbols that failed permanently (HTTP error / unparseable page) are skipped
+# for this long; persisted next to the CSV output between runs
+_FAILURE_TTL = 3600
+_FAILURE_CACHE_FILE = 'vietstock_failed_symbols.json'
+
+_WARRANT_SYM_RE = re.compile(r'^C([A-Z]+)\d+$')
+_SUSPENDED_RE = re.compile(r'ngừng|suspended|stop', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=1024)
+def _infer_underlying(symbol: str) -> Optional[str]:
+    """Infer the underlying from a warrant symbol (e.g. CACB2502 -> ACB)"""
+    match = _WARRANT_SYM_RE.match(symbol)
+    return match.group(1) if match else None
+
+
+def _parse_expiry_date(expiry_str: str) -> Optional[date]:
+    """
+    Parse an expiry date, picking the format from its separator so only
+    one parse is attempted ('12/05/2025' -> strptime, '2025-05-12' -> ISO)
+    """
+    try:
+        if '/' in expiry_str:
+            return datetime.strptime(expiry_str, '%d/%m/%Y').date()
+        return date.fromisoformat(expiry_str)
+    except ValueError:
+        return None
+
+
 class ComprehensiveWarrantService:
     """
     Comprehensive warrant service combining all data sources
@@ -46,12 +327,74 @@ class ComprehensiveWarrantService:
             'Connection': 'keep-alive'
         }
         
-        # Cache for performance
-        self.warrant_cache = {}
-        self.underlying_cache = {}
+        # Bounded caches: warrant specs rarely change, underlying quotes go stale
+        self.warrant_cache = _LRUCache(maxsize=512)
+        self.underlying_cache = _LRUCache(maxsize=128, ttl=5 * 60)
+        
+        # Daily history/volatility per underlying, shared by all its warrants
+        self._history_cache = _LRUCache(maxsize=128)
+        self._vol_cache = _LRUCache(maxsize=128)
+        
+        # HTML parsing is CPU-bound; run it in worker processes so it
+        # overlaps with in-flight requests instead of holding the GIL.
+        # Created on first use (see _get_parse_pool) and released by close()
+        self._parse_pool: Optional[ProcessPoolExecutor] = None
+        
+        # symbol -> time.time() of last permanent failure
+        self._failure_cache: Dict[str, float] = self._load_failure_cache()
         
         logger.info("Comprehensive warrant service initialized")
     
+    def _load_failure_cache(self) -> Dict[str, float]:
+        """Load recently failed symbols persisted by a previous run"""
+        try:
+            with open(_FAILURE_CACHE_FILE, encoding='utf-8') as f:
+                failures = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        
+        now = time.time()
+        return {symbol: ts for symbol, ts in failures.items() if now - ts < _FAILURE_TTL}
+    
+    def _save_failure_cache(self):
+        """Persist recently failed symbols for the next run"""
+        try:
+            with open(_FAILURE_CACHE_FILE, 'w', encoding='utf-8') as f:
+                json.dump(self._failure_cache, f)
+        except OSError as e:
+            logger.warning(f"Could not save failed symbols: {e}")
+    
+    def _mark_failed(self, symbol: str):
+        """Remember a permanent scrape failure so retries skip the symbol"""
+        self._failure_cache[symbol] = time.time()
+    
+    def _get_parse_pool(self) -> ProcessPoolExecutor:
+        """
+        Parser process pool, started on first use
+        
+        Workers are spawned rather than forked: by the time a page is parsed the
+        event loop's executor threads exist, and forking a threaded process can
+        leave locks held in the child.
+        """
+        if self._parse_pool is None:
+            self._parse_pool = ProcessPoolExecutor(max_workers=os.cpu_count(),
+                                                   mp_context=multiprocessing.get_context('spawn'))
+        return self._parse_pool
+    
+    def close(self):
+        """Release the parser process pool (a later scrape starts a new one)"""
+        if self._parse_pool is not None:
+            self._parse_pool.shutdown(wait=True, cancel_futures=True)
+            self._parse_pool = None
+    
+    async def __aenter__(self) -> 'ComprehensiveWarrantService':
+        """Use the service as ``async with``; the pool is closed on exit"""
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the parser process pool"""
+        self.close()
+    
     async def get_all_warrant_symbols(self) -> List[str]:
         """
         Get complete list of warrant symbols from vnstock
@@ -77,121 +420,6 @@ class ComprehensiveWarrantService:
             logger.error(f"Error fetching warrant symbols: {e}")
             return []
     
-    def _parse_warrant_details_from_vietstock(self, html_content: str, symbol: str) -> Dict[str, Any]:
-        """
-        Parse warrant details from Vietstock HTML content
-        Enhanced parsing with multiple fallback patterns
-        
-        Args:
-            html_content: HTML content from Vietstock
-            symbol: Warrant symbol
-            
-        Returns:
-            Dictionary with parsed warrant details
-        """
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text = soup.get_text()
-        
-        # Enhanced regex patterns with multiple alternatives
-        parsing_patterns = {
-            'strike_price': [
-                r'Giá thực hiện[:\s]*([0-9,]+)',
-                r'thực hiện[:\s]*([0-9,]+)', 
-                r'Strike[:\s]*([0-9,]+)',
-                r'Exercise price[:\s]*([0-9,]+)'
-            ],
-            'expiration_date': [
-                r'Ngày đáo hạn[:\s]*([0-9/]+)',
-                r'đáo hạn[:\s]*([0-9/]+)',
-                r'Expiration[:\s]*([0-9/]+)',
-                r'Maturity[:\s]*([0-9/]+)'
-            ],
-            'conversion_ratio': [
-                r'Tỷ lệ chuyển đổi[:\s]*([0-9:.]+)',
-                r'chuyển đổi[:\s]*([0-9:.]+)',
-                r'Conversion[:\s]*([0-9:.]+)',
-                r'Ratio[:\s]*([0-9:.]+)'
-            ],
-            'issue_price': [
-                r'Giá phát hành[:\s]*([0-9,]+)',
-                r'phát hành[:\s]*([0-9,]+)',
-                r'Issue price[:\s]*([0-9,]+)',
-                r'Initial price[:\s]*([0-9,]+)'
-            ],
-            'underlying_stock': [
-                r'CK cơ sở[:\s]*([A-Z]+)',
-                r'cơ sở[:\s]*([A-Z]+)',
-                r'Underlying[:\s]*([A-Z]+)',
-                r'Base stock[:\s]*([A-Z]+)'
-            ],
-            'issuer': [
-                r'Tổ chức phát hành CW[:\s]*([^\\n]+)',
-                r'phát hành CW[:\s]*([^\\n]+)',
-                r'Issuer[:\s]*([^\\n]+)',
-                r'Issued by[:\s]*([^\\n]+)'
-            ],
-            'current_price': [
-                r'([0-9,]+)\s*[+-]?[0-9,]*\s*\([+-]?[0-9.]+%\)',
-                r'Giá hiện tại[:\s]*([0-9,]+)',
-                r'Current[:\s]*([0-9,]+)'
-            ],
-            'trading_status': [
-                r'(Ngừng giao dịch|Đang giao dịch|Suspended|Active|Trading)',
-                r'Trạng thái[:\s]*([^\\n]+)',
-                r'Status[:\s]*([^\\n]+)'
-            ]
-        }
-        
-        # Extract information using multiple patterns
-        warrant_info = {'symbol': symbol}
-        
-        for field, patterns in parsing_patterns.items():
-            value_found = False
-            
-            for pattern in patterns:
-                match = re.search(pattern, text, re.IGNORECASE)
-                if match:
-                    warrant_info[field] = match.group(1).strip()
-                    value_found = True
-                    break
-            
-            if not value_found:
-                warrant_info[field] = None
-        
-        # Additional data extraction from tables
-        tables = soup.find_all('table')
-        for table in tables:
-            table_text = table.get_text()
-            
-            # Look for additional warrant data in table format
-            if 'thực hiện' in table_text or 'Strike' in table_text:
-                rows = table.find_all('tr')
-                for row in rows:
-                    cells = row.find_all(['td', 'th'])
-                    if len(cells) >= 2:
-                        label = cells[0].get_text().strip()
-                        value = cells[1].get_text().strip()
-                        
-                        # Map table data to our fields
-                        if 'thực hiện' in label and not warrant_info.get('strike_price'):
-                            strike_match = re.search(r'([0-9,]+)', value)
-                            if strike_match:
-                                warrant_info['strike_price'] = strike_match.group(1)
-                        
-                        elif 'đáo hạn' in label and not warrant_info.get('expiration_date'):
-                            date_match = re.search(r'([0-9/]+)', value)
-                            if date_match:
-                                warrant_info['expiration_date'] = date_match.group(1)
-        
-        # Clean up data
-        for key, value in warrant_info.items():
-            if value and isinstance(value, str):
-                warrant_info[key] = value.strip()
-                if warrant_info[key] == '':
-                    warrant_info[key] = None
-        
-        return warrant_info
-    
     async def scrape_warrant_specification(self, symbol: str) -> Optional[WarrantSpecification]:
         """
         Scrape complete warrant specification for a single warrant
@@ -202,8 +430,13 @@ class ComprehensiveWarrantService:
         Returns:
             WarrantSpecification object or None
         """
-        if symbol in self.warrant_cache:
-            return self.warrant_cache[symbol]
+        cached_spec = self.warrant_cache.get(symbol)
+        if cached_spec is not None:
+            return cached_spec
+        
+        if time.time() - self._failure_cache.get(symbol, 0) < _FAILURE_TTL:
+            logger.debug(f"Skipping {symbol}: failed recently")
+            return None
         
         try:
             # Construct Vietstock URL
@@ -211,11 +444,18 @@ class ComprehensiveWarrantService:
             
             logger.debug(f"Scraping {symbol} from {url}")
             
-            response = requests.get(url, headers=self.headers, timeout=self.timeout)
+            loop = asyncio.get_running_loop()
+            response = await loop.run_in_executor(
+                None, functools.partial(requests.get, url, headers=self.headers, timeout=self.timeout)
+            )
             
             if response.status_code == 200:
-                # Parse warrant details
-                warrant_info = self._parse_warrant_details_from_vietstock(response.text, symbol)
+                # Parse warrant details in the process pool
+                # Raw bytes + declared encoding: avoids chardet behind response.text
+                warrant_info = await loop.run_in_executor(
+                    self._get_parse_pool(), _parse_warrant_details_from_vietstock,
+                    response.content, symbol, response.encoding or 'utf-8'
+                )
                 
                 # Convert to WarrantSpecification
                 warrant_spec = self._create_warrant_specification(warrant_info)
@@ -227,9 +467,11 @@ class ComprehensiveWarrantService:
                     return warrant_spec
                 else:
                     logger.warning(f"⚠️  Could not create specification for {symbol}")
+                    self._mark_failed(symbol)
                     return None
             else:
                 logger.warning(f"❌ HTTP {response.status_code} for {symbol}")
+                self._mark_failed(symbol)
                 return None
                 
         except Exception as e:
@@ -260,14 +502,10 @@ class ComprehensiveWarrantService:
             # Parse expiration date
             expiry_str = warrant_info.get('expiration_date')
             if expiry_str:
-                try:
-                    expiration_date = datetime.strptime(expiry_str, '%d/%m/%Y').date()
-                except ValueError:
-                    try:
-                        expiration_date = datetime.strptime(expiry_str, '%Y-%m-%d').date()
-                    except ValueError:
-                        logger.warning(f"Could not parse expiry date for {symbol}: {expiry_str}")
-                        return None
+                expiration_date = _parse_expiry_date(expiry_str)
+                if expiration_date is None:
+                    logger.warning(f"Could not parse expiry date for {symbol}: {expiry_str}")
+                    return None
             else:
                 logger.warning(f"No expiration date for {symbol}")
                 return None
@@ -292,11 +530,7 @@ class ComprehensiveWarrantService:
                 underlying_symbol = underlying_symbol.upper()
             else:
                 # Try to infer from warrant symbol (e.g., CACB2502 -> ACB)
-                match = re.match(r'^C([A-Z]+)\d+$', symbol)
-                if match:
-                    underlying_symbol = match.group(1)
-                else:
-                    underlying_symbol = 'UNKNOWN'
+                underlying_symbol = _infer_underlying(symbol) or 'UNKNOWN'
             
             # Parse issue price
             issue_price_str = warrant_info.get('issue_price')
@@ -318,11 +552,8 @@ class ComprehensiveWarrantService:
                     pass
             
             # Determine status
-            status_str = warrant_info.get('trading_status', '').lower()
-            if any(word in status_str for word in ['ngừng', 'suspended', 'stop']):
-                status = WarrantStatus.SUSPENDED
-            else:
-                status = WarrantStatus.TRADING
+            status_str = warrant_info.get('trading_status') or ''
+            status = WarrantStatus.SUSPENDED if _SUSPENDED_RE.search(status_str) else WarrantStatus.TRADING
             
             # Calculate time to expiry
             time_to_expiry = (expiration_date - date.today()).days / 365.25
@@ -335,7 +566,7 @@ class ComprehensiveWarrantService:
                 strike_price=strike_price,
                 expiration_date=expiration_date,
                 conversion_ratio=conversion_ratio,
-                issuer=warrant_info.get('issuer', 'Unknown'),
+                issuer=warrant_info.get('issuer') or 'Unknown',
                 issue_price=issue_price,
                 current_price=current_price,
                 time_to_expiry=time_to_expiry,
@@ -350,13 +581,16 @@ class ComprehensiveWarrantService:
     
     async def scrape_all_warrants_comprehensive(self, 
                                               batch_size: int = 10,
-                                              max_warrants: int = None) -> List[WarrantSpecification]:
+                                              max_warrants: int = None,
+                                              output_file: Optional[TextIO] = None) -> List[WarrantSpecification]:
         """
         Scrape complete specifications for all warrants
         
         Args:
             batch_size: Number of warrants to process concurrently
             max_warrants: Maximum warrants to process (None for all)
+            output_file: Optional open CSV file; each warrant is written and
+                flushed as soon as it is scraped so partial runs survive
             
         Returns:
             List of WarrantSpecification objects
@@ -374,6 +608,7 @@ class ComprehensiveWarrantService:
         
         all_warrants = []
         failed_count = 0
+        writer = None
         
         # Process in batches
         for i in range(0, len(warrant_symbols), batch_size):
@@ -400,6 +635,15 @@ class ComprehensiveWarrantService:
                 elif result:
                     all_warrants.append(result)
                     logger.debug(f"   ✅ {symbol}: Strike={result.strike_price}")
+                    
+                    if output_file is not None:
+                        row = result.dict()
+                        if writer is None:
+                            writer = csv.DictWriter(output_file, fieldnames=list(row.keys()))
+                            if output_file.tell() == 0:
+                                writer.writeheader()
+                        writer.writerow(row)
+                        output_file.flush()
                 else:
                     logger.warning(f"   ⚠️  {symbol}: No result")
                     failed_count += 1
@@ -420,6 +664,47 @@ class ComprehensiveWarrantService:
         
         return all_warrants
     
+    def _get_underlying_history(self, underlying_quote: Quote, underlying_symbol: str) -> pd.DataFrame:
+        """
+        Get daily price history for an underlying, fetched at most once per day
+        
+        Args:
+            underlying_quote: vnstock Quote for the underlying
+            underlying_symbol: Underlying stock symbol
+            
+        Returns:
+            Historical OHLCV DataFrame
+        """
+        key = (underlying_symbol, date.today())
+        hist_data = self._history_cache.get(key)
+        if hist_data is None:
+            hist_data = underlying_quote.history(start='2024-01-01', end=key[1].strftime('%Y-%m-%d'))
+            self._history_cache[key] = hist_data
+        return hist_data
+    
+    def _get_underlying_volatility(self, underlying_quote: Quote, underlying_symbol: str) -> Optional[float]:
+        """
+        Get annualized historical volatility for an underlying, cached per day
+        
+        Args:
+            underlying_quote: vnstock Quote for the underlying
+            underlying_symbol: Underlying stock symbol
+            
+        Returns:
+            Annualized volatility or None if no history is available
+        """
+        key = (underlying_symbol, date.today())
+        volatility = self._vol_cache.get(key)
+        if volatility is None:
+            hist_data = self._get_underlying_history(underlying_quote, underlying_symbol)
+            closes = hist_data['close'].to_numpy(dtype=np.float64) if not hist_data.empty else None
+            if closes is None or closes.size < 3:
+                return None
+            returns = np.diff(closes) / closes[:-1]
+            volatility = float(returns.std(ddof=1) * _SQRT_252)
+            self._vol_cache[key] = volatility
+        return volatility
+    
     async def get_warrant_with_market_data(self, symbol: str) -> Optional[Dict[str, Any]]:
         """
         Get complete warrant data including market data and underlying data
@@ -455,6 +740,9 @@ class ComprehensiveWarrantService:
             # Get underlying stock data
             underlying_data = None
             if warrant_spec.underlying_symbol != 'UNKNOWN':
+                underlying_data = self.underlying_cache.get(warrant_spec.underlying_symbol)
+            
+            if underlying_data is None and warrant_spec.underlying_symbol != 'UNKNOWN':
                 try:
                     underlying_quote = Quote(symbol=warrant_spec.underlying_symbol, source=self.vnstock_source)
                     underlying_intraday = underlying_quote.intraday(page_size=1)
@@ -470,13 +758,13 @@ class ComprehensiveWarrantService:
                         
                         # Calculate volatility from historical data
                         try:
-                            hist_data = underlying_quote.history(start='2024-01-01', end=datetime.now().strftime('%Y-%m-%d'))
-                            if not hist_data.empty:
-                                returns = hist_data['close'].pct_change().dropna()
-                                volatility = returns.std() * (252 ** 0.5)
+                            volatility = self._get_underlying_volatility(underlying_quote, warrant_spec.underlying_symbol)
+                            if volatility is not None:
                                 underlying_data['volatility'] = volatility
                         except Exception:
                             underlying_data['volatility'] = 0.25  # Default volatility
+                        
+                        self.underlying_cache[warrant_spec.underlying_symbol] = underlying_data
                             
                 except Exception as e:
                     logger.warning(f"Could not get underlying data for {warrant_spec.underlying_symbol}: {e}")
@@ -511,28 +799,18 @@ class ComprehensiveWarrantService:
         
         logger.info(f"🎯 Creating complete warrant database: {filename}")
         
-        # Scrape all warrants
-        warrants = await self.scrape_all_warrants_comprehensive()
+        # Scrape all warrants, appending each row to the CSV as it arrives
+        try:
+            with open(filename, 'a', newline='', encoding='utf-8') as f:
+                warrants = await self.scrape_all_warrants_comprehensive(output_file=f)
+        finally:
+            self._save_failure_cache()
+            self.close()
         
         if not warrants:
             logger.error("No warrants scraped")
             return ""
         
-        # Convert to DataFrame
-        warrant_data = []
-        for warrant in warrants:
-            data = warrant.dict()
-            # Flatten some fields for CSV
-            data['expiration_date'] = data['expiration_date']
-            data['created_at'] = data['created_at']
-            data['updated_at'] = data['updated_at']
-            warrant_data.append(data)
-        
-        df = pd.DataFrame(warrant_data)
-        
-        # Save to CSV
-        df.to_csv(filename, index=False, encoding='utf-8')
-        
         logger.info(f"✅ Warrant database created: {filename}")
         logger.info(f"   📊 Total warrants: {len(warrants)}")
         logger.info(f"   🎯 Exceeds 300 target: {'Yes' if len(warrants) >= 300 else 'No'}")
@@ -573,6 +851,8 @@ async def test_comprehensive_service():
             print("   🎉 EXCEEDS 300 TARGET!")
         else:
             print("   📊 Below 300 but substantial dataset available")
+    
+    service.close()
 
 if __name__ == "__main__":
     asyncio.run(test_comprehensive_service()) 
\ No newline at end of file
@@ -0,0 +1,85 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled Black-Scholes price and Greeks for SecondOrderGreeksCalculator
+
+Build in place with:  cythonize -i backend/services/greeks_services/_bs_cy.pyx
+(add -fopenmp to the compile and link flags for a parallel all_greeks_vec).
+Without the compiled module the calculator uses its NumPy implementation.
+
+Outputs follow SecondOrderGreeksCalculator._compute_all_greeks_fused, in order:
+price, delta, gamma, vega, theta, rho, vanna, volga, charm, veta, as
+Black-Scholes-Merton sensitivities in raw model units (per 1.0 move, per year).
+"""
+
+from cython.parallel import prange
+from libc.math cimport log, sqrt, exp, erfc, M_SQRT1_2
+
+cdef double RSQRT2PI = 0.3989422804014327
+
+
+cdef inline double _ndtr(double x) noexcept nogil:
+    return 0.5 * erfc(-x * M_SQRT1_2)
+
+
+cdef inline void _greeks_one(double S, double K, double T, double r, double sigma,
+                             double q, double cp, double* out) noexcept nogil:
+    cdef double sqrt_t, sig_sqrt_t, d1, d2, emqt, emrt, phi_d1, Phi_d1, Phi_d2
+    cdef double eqt_Phi_d1, k_ert_Phi_d2, eqt_phi_d1, vega
+    cdef int j
+
+    if T <= 0.0:
+        out[0] = cp * (S - K) if cp * (S - K) > 0.0 else 0.0
+        if cp > 0.0:
+            out[1] = 1.0 if S > K else 0.0
+        else:
+            out[1] = -1.0 if S <= K else 0.0
+        for j in range(2, 10):
+            out[j] = 0.0
+        return
+
+    sqrt_t = sqrt(T)
+    sig_sqrt_t = sigma * sqrt_t
+    d1 = (log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+
+    emqt = exp(-q * T)
+    emrt = exp(-r * T)
+    phi_d1 = RSQRT2PI * exp(-0.5 * d1 * d1)
+    Phi_d1 = _ndtr(cp * d1)
+    Phi_d2 = _ndtr(cp * d2)
+
+    eqt_Phi_d1 = emqt * Phi_d1
+    k_ert_Phi_d2 = K * emrt * Phi_d2
+    eqt_phi_d1 = emqt * phi_d1
+    vega = S * eqt_phi_d1 * sqrt_t
+
+    out[0] = cp * (S * eqt_Phi_d1 - k_ert_Phi_d2)
+    out[1] = cp * eqt_Phi_d1
+    out[2] = eqt_phi_d1 / (S * sig_sqrt_t)
+    out[3] = vega
+    out[4] = -S * eqt_phi_d1 * sigma / (2.0 * sqrt_t) - cp * (r * k_ert_Phi_d2 - q * S * eqt_Phi_d1)
+    out[5] = cp * T * k_ert_Phi_d2
+    out[6] = -eqt_phi_d1 * d2 / sigma
+    out[7] = vega * d1 * d2 / sigma
+    out[8] = (-cp * q * eqt_Phi_d1
+              + eqt_phi_d1 * (2.0 * (r - q) * T - d2 * sig_sqrt_t) / (2.0 * T * sig_sqrt_t))
+    out[9] = -vega * (q + (r - q) * d1 / sig_sqrt_t - (1.0 + d1 * d2) / (2.0 * T))
+
+
+cpdef tuple all_greeks(double S, double K, double T, double r, double sigma,
+                       double q, int is_call):
+    '''Return the ten outputs for one option as a tuple'''
+    cdef double out[10]
+    _greeks_one(S, K, T, r, sigma, q, 1.0 if is_call else -1.0, out)
+    return (out[0], out[1], out[2], out[3], out[4],
+            out[5], out[6], out[7], out[8], out[9])
+
+
+cpdef void all_greeks_vec(const double[::1] S, const double[::1] K, const double[::1] T,
+                          const double[::1] r, const double[::1] sigma, const double[::1] q,
+                          const double[::1] cp, double[:, ::1] out) noexcept nogil:
+    '''Fill row i of out (shape (n, 10)) with the ten outputs for option i'''
+    cdef Py_ssize_t i, n = S.shape[0]
+
+    for i in prange(n, schedule='static'):
+        _greeks_one(S[i], K[i], T[i], r[i], sigma[i], q[i], cp[i], &out[i, 0])
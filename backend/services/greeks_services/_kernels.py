@@ -0,0 +1,148 @@
+"""
+Closed-form Black-Scholes-Merton kernels for the Greeks services
+
+bs_all_greeks is the Numba-compiled price, first and second-order Greeks of
+one option, used by SecondOrderGreeksCalculator when the Cython module is
+not built. bs_price_greeks_torch prices a batch of options and their
+first-order Greeks on a PyTorch device (CUDA when available). Greeks are in
+raw model units (vega/rho per 1.0 change, theta per year); callers apply
+their own display scaling. The CPU batch path lives in
+BlackScholesPricer.price_with_greeks_batch.
+"""
+
+import math
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import torch
+    TORCH_AVAILABLE = True
+except ImportError:
+    TORCH_AVAILABLE = False
+
+_RSQRT2PI = 1.0 / math.sqrt(2.0 * math.pi)
+
+# Abramowitz & Stegun 26.2.17 coefficients for the normal CDF
+_A = (0.31938153, -0.356563782, 1.781477937, -1.821255978, 1.330274429)
+
+# Only cache compiled code under the name the app imports (see black_scholes_pricer)
+_NUMBA_CACHE = __name__.startswith('services.')
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=_NUMBA_CACHE, fastmath=True)
+    def _cnd(d):
+        # Absolute error below 7.5e-8; reuses the exp(-d²/2) the PDF needs anyway
+        k = 1.0 / (1.0 + 0.2316419 * abs(d))
+        r = _RSQRT2PI * math.exp(-0.5 * d * d) * (
+            k * (_A[0] + k * (_A[1] + k * (_A[2] + k * (_A[3] + k * _A[4]))))
+        )
+        return 1.0 - r if d > 0 else r
+    
+    @njit(cache=_NUMBA_CACHE, fastmath=True)
+    def bs_all_greeks(S, K, T, r, sigma, q, cp):
+        """
+        Price plus first and second-order Greeks of one option in a single pass
+        
+        Args:
+            S, K, T, r, sigma, q: Black-Scholes parameters
+            cp: +1.0 for a call, -1.0 for a put
+            
+        Returns:
+            Tuple of (price, delta, gamma, vega, theta, rho, vanna, volga,
+            charm, veta) in raw model units; the normal CDF is the
+            Abramowitz & Stegun polynomial, so values agree with the
+            erfc-based paths to about 1e-7 of S
+        """
+        if T <= 0.0:
+            if cp > 0.0:
+                delta = 1.0 if S > K else 0.0
+            else:
+                delta = -1.0 if S <= K else 0.0
+            return max(cp * (S - K), 0.0), delta, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0
+        
+        sqrt_t = math.sqrt(T)
+        sig_sqrt_t = sigma * sqrt_t
+        d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sig_sqrt_t
+        d2 = d1 - sig_sqrt_t
+        
+        eqt_n_d1 = math.exp(-q * T) * _cnd(cp * d1)
+        k_ert_n_d2 = K * math.exp(-r * T) * _cnd(cp * d2)
+        eqt_phi_d1 = math.exp(-q * T - 0.5 * d1 * d1) * _RSQRT2PI
+        vega = S * eqt_phi_d1 * sqrt_t
+        
+        return (cp * (S * eqt_n_d1 - k_ert_n_d2),
+                cp * eqt_n_d1,
+                eqt_phi_d1 / (S * sig_sqrt_t),
+                vega,
+                -S * eqt_phi_d1 * sigma / (2.0 * sqrt_t) - cp * (r * k_ert_n_d2 - q * S * eqt_n_d1),
+                cp * T * k_ert_n_d2,
+                -eqt_phi_d1 * d2 / sigma,
+                vega * d1 * d2 / sigma,
+                -cp * q * eqt_n_d1 + eqt_phi_d1 * (2.0 * (r - q) * T - d2 * sig_sqrt_t) / (2.0 * T * sig_sqrt_t),
+                -vega * (q + (r - q) * d1 / sig_sqrt_t - (1.0 + d1 * d2) / (2.0 * T)))
+    
+    # Compile (or load from the on-disk cache) at import, not on the first request
+    bs_all_greeks(1.0, 1.0, 1.0, 0.0, 1.0, 0.0, 1.0)
+
+
+def bs_price_greeks_torch(S, K, T, sigma, r, q, cp, device=None):
+    """
+    Price and first-order Greeks on a PyTorch device (CUDA when available)
+    
+    Args:
+        S, K, T, sigma, r, q: float64 arrays of model inputs
+        cp: +1 for calls, -1 for puts
+        device: Torch device; defaults to 'cuda' if present, else 'cpu'
+        
+    Returns:
+        Tuple of float64 NumPy arrays (price, delta, gamma, vega, theta, rho)
+    """
+    if device is None:
+        device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    S, K, T, sigma, r, q, cp = (
+        torch.as_tensor(x, dtype=torch.float64, device=device) for x in (S, K, T, sigma, r, q, cp)
+    )
+    
+    sqrt_t = torch.sqrt(T)
+    sig_sqrt_t = sigma * sqrt_t
+    # Zero-volatility options divide by one instead and are overwritten below
+    flat = (sig_sqrt_t <= 0) & (T > 0)
+    sig_sqrt_t = torch.where(flat, torch.ones_like(T), sig_sqrt_t)
+    d1 = (torch.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sig_sqrt_t
+    d2 = d1 - sig_sqrt_t
+    eqt = torch.exp(-q * T)
+    ert = torch.exp(-r * T)
+    eqt_n_d1 = eqt * torch.special.ndtr(cp * d1)
+    k_ert_n_d2 = K * ert * torch.special.ndtr(cp * d2)
+    eqt_phi_d1 = eqt * _RSQRT2PI * torch.exp(-0.5 * d1 * d1)
+    
+    price = cp * (S * eqt_n_d1 - k_ert_n_d2)
+    delta = cp * eqt_n_d1
+    gamma = eqt_phi_d1 / (S * sig_sqrt_t)
+    vega = S * eqt_phi_d1 * sqrt_t
+    theta = -S * eqt_phi_d1 * sigma / (2.0 * sqrt_t) - cp * (r * k_ert_n_d2 - q * S * eqt_n_d1)
+    rho = cp * T * k_ert_n_d2
+    
+    if bool(flat.any()):
+        # Discounted intrinsic value against the deterministic forward
+        zero = torch.zeros_like(T)
+        itm = flat & (cp * (torch.log(S / K) + (r - q) * T) > 0)
+        price = torch.where(itm, cp * (S * eqt - K * ert), torch.where(flat, zero, price))
+        delta = torch.where(itm, cp * eqt, torch.where(flat, zero, delta))
+        theta = torch.where(itm, cp * (q * S * eqt - r * K * ert), torch.where(flat, zero, theta))
+        rho = torch.where(itm, cp * T * K * ert, torch.where(flat, zero, rho))
+        gamma, vega = (torch.where(flat, zero, x) for x in (gamma, vega))
+    
+    expired = T <= 0
+    if bool(expired.any()):
+        zero = torch.zeros_like(T)
+        price = torch.where(expired, torch.clamp(cp * (S - K), min=0.0), price)
+        delta = torch.where(expired, torch.where(cp > 0, (S > K).double(), -(S <= K).double()), delta)
+        gamma, vega, theta, rho = (torch.where(expired, zero, x) for x in (gamma, vega, theta, rho))
+    
+    return tuple(x.cpu().numpy() for x in (price, delta, gamma, vega, theta, rho))
@@ -0,0 +1,20 @@
+# cython: boundscheck=False, wraparound=False, cdivision=True
+"""
+Compiled VaR combination step for AdvancedGreeksCalculator.calculate_greeks_var
+
+Build in place with:  cythonize -i backend/services/greeks_services/_var_math.pyx
+Without the compiled module the calculator uses its pure-Python equivalent.
+"""
+
+
+cpdef tuple var_components(double net_delta, double net_gamma, double net_vega,
+                           double net_theta, double avg_price, double delta_S,
+                           double delta_sigma, double delta_t):
+    '''Return (total, delta, gamma, vega, theta) VaR components'''
+    cdef double pc = avg_price * delta_S
+    cdef double delta_var = net_delta * pc
+    cdef double gamma_var = 0.5 * net_gamma * pc * pc
+    cdef double vega_var = net_vega * delta_sigma * 100.0
+    cdef double theta_var = net_theta * delta_t
+    return (delta_var + gamma_var + vega_var + theta_var,
+            delta_var, gamma_var, vega_var, theta_var)
@@ -9,10 +9,15 @@ Provides:
 - Portfolio Greeks aggregation
 """
 
+import functools
+import itertools
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, date
 from typing import List, Dict, Optional
 import numpy as np
+import pandas as pd
 
 # Try different import methods
 try:
@@ -21,17 +26,149 @@ try:
         GreeksEvolution, RiskLevel, RiskAlert
     )
     from ...models.warrant_models import WarrantSpecification
-    from ..pricing_services.black_scholes_pricer import BlackScholesPricer
+    from ..pricing_services.black_scholes_pricer import (
+        BlackScholesPricer, BSBatchResult, NUMBA_AVAILABLE as PRICER_JIT_AVAILABLE
+    )
+    from ._kernels import TORCH_AVAILABLE, bs_price_greeks_torch
 except ImportError:
     from models.greeks_models import (
         Greeks, PortfolioGreeks, GammaRiskAnalysis, VegaRiskAnalysis,
         GreeksEvolution, RiskLevel, RiskAlert
     )
     from models.warrant_models import WarrantSpecification
-    from services.pricing_services.black_scholes_pricer import BlackScholesPricer
+    from services.pricing_services.black_scholes_pricer import (
+        BlackScholesPricer, BSBatchResult, NUMBA_AVAILABLE as PRICER_JIT_AVAILABLE
+    )
+    from services.greeks_services._kernels import TORCH_AVAILABLE, bs_price_greeks_torch
 
 logger = logging.getLogger(__name__)
 
+# Books larger than this are priced in chunks on a thread pool when the
+# pricer falls back to NumPy (its ufuncs release the GIL on large arrays)
+_THREAD_CHUNK = 50_000
+_MAX_WORKERS = 10
+
+# |gamma dollars| bounds between LOW, MEDIUM, HIGH and CRITICAL gamma risk
+_GAMMA_DOLLAR_BOUNDS = [1_000, 10_000, 50_000]
+_RISK_LEVELS = (RiskLevel.LOW, RiskLevel.MEDIUM, RiskLevel.HIGH, RiskLevel.CRITICAL)
+
+# calculate_greeks memoizes pricer results on inputs rounded to these decimals;
+# repeated quote ticks for the same warrant then skip re-pricing
+_GREEKS_CACHE_SIZE = 16384
+_PRICE_DECIMALS = 2
+_PARAM_DECIMALS = 6
+
+# Portfolio ids: process start time plus a sequence number, unique at any call rate
+_pf_epoch = time.time_ns()
+_pf_seq = itertools.count()
+
+
+def _extract_positions_arrays(positions: List[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Gather position fields into NumPy arrays for vectorized pricing
+    
+    Args:
+        positions: List of position dictionaries with warrant details and quantities
+        
+    Returns:
+        Dictionary of float64 arrays keyed by field name, plus 'cp'
+        (+1 for calls, -1 for puts)
+        
+    Raises:
+        ValueError: If any position has inputs the pricer would reject
+    """
+    n = len(positions)
+    
+    def column(key, default=None):
+        values = (p[key] if default is None else p.get(key, default) for p in positions)
+        return np.fromiter(values, dtype=np.float64, count=n)
+    
+    arrays = {
+        'underlying_price': column('underlying_price'),
+        'strike_price': column('strike_price'),
+        'time_to_maturity': column('time_to_maturity'),
+        'volatility': column('volatility'),
+        'risk_free_rate': column('risk_free_rate', 0.04),
+        'dividend_yield': column('dividend_yield', 0.0),
+        'quantity': column('quantity', 0),
+        'option_price': column('option_price', 0),
+        'cp': np.fromiter(
+            (1.0 if p.get('option_type', 'c').lower() == 'c' else -1.0 for p in positions),
+            dtype=np.float64, count=n
+        ),
+    }
+    
+    _validate_position_arrays(arrays, lambda i: positions[i].get('symbol'))
+    return arrays
+
+
+def _frame_to_arrays(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """
+    Column-wise counterpart of _extract_positions_arrays for a DataFrame
+    
+    Args:
+        df: One row per position, columns named like the position dictionary keys
+        
+    Returns:
+        Dictionary of float64 arrays keyed by field name, plus 'cp'
+        
+    Raises:
+        KeyError: If a required column is missing
+        ValueError: If any position has inputs the pricer would reject
+    """
+    n = len(df)
+    
+    def column(key, default=None):
+        if default is None:
+            return df[key].to_numpy(dtype=np.float64)
+        if key not in df:
+            return np.full(n, default, dtype=np.float64)
+        # Rows built from dicts that omit the key hold NaN; default them like the dict path
+        return df[key].fillna(default).to_numpy(dtype=np.float64)
+    
+    if 'option_type' in df:
+        cp = np.where(df['option_type'].fillna('c').str.lower().to_numpy() == 'c', 1.0, -1.0)
+    else:
+        cp = np.ones(n)
+    
+    arrays = {
+        'underlying_price': column('underlying_price'),
+        'strike_price': column('strike_price'),
+        'time_to_maturity': column('time_to_maturity'),
+        'volatility': column('volatility'),
+        'risk_free_rate': column('risk_free_rate', 0.04),
+        'dividend_yield': column('dividend_yield', 0.0),
+        'quantity': column('quantity', 0),
+        'option_price': column('option_price', 0),
+        'cp': cp,
+    }
+    
+    symbols = df['symbol'].to_numpy() if 'symbol' in df else np.full(n, None)
+    _validate_position_arrays(arrays, symbols.__getitem__)
+    return arrays
+
+
+def _validate_position_arrays(arrays: Dict[str, np.ndarray], symbol_at) -> None:
+    """
+    Same checks as BlackScholesPricer._validate_inputs, for the whole book at once
+    
+    Args:
+        arrays: Position arrays keyed by field name
+        symbol_at: Callable returning the symbol of the position at an index
+        
+    Raises:
+        ValueError: If any position has inputs the pricer would reject
+    """
+    r = arrays['risk_free_rate']
+    valid = (
+        (arrays['underlying_price'] > 0) & (arrays['strike_price'] > 0)
+        & (arrays['time_to_maturity'] >= 0) & (arrays['volatility'] >= 0)
+        & (r >= -0.5) & (r <= 0.5)
+    )
+    if not valid.all():
+        invalid = [symbol_at(i) for i in np.flatnonzero(~valid)]
+        raise ValueError(f"Invalid pricing inputs for positions: {invalid}")
+
 
 class GreeksCalculator:
     """
@@ -41,15 +178,24 @@ class GreeksCalculator:
     and risk management analytics
     """
     
-    def __init__(self, use_vn_config: bool = True):
+    def __init__(self, use_vn_config: bool = True, backend: str = 'numpy'):
         """
         Initialize Greeks calculator
         
         Args:
             use_vn_config: Use Vietnamese market configuration
+            backend: 'numpy' (CPU pricer) or 'torch' (GPU when available)
+                for portfolio pricing
         """
+        if backend not in ('numpy', 'torch'):
+            raise ValueError(f"Unknown backend '{backend}', expected 'numpy' or 'torch'")
+        if backend == 'torch' and not TORCH_AVAILABLE:
+            raise ImportError("PyTorch is required for backend='torch'. Install with: pip install torch")
+        
         self.pricer = BlackScholesPricer(use_vn_config=use_vn_config)
-        logger.info("GreeksCalculator initialized")
+        self.backend = backend
+        self._price_cached = functools.lru_cache(maxsize=_GREEKS_CACHE_SIZE)(self.pricer.price_with_greeks)
+        logger.info(f"GreeksCalculator initialized (backend={backend})")
     
     def calculate_greeks(self, symbol: str, underlying_price: float, strike_price: float,
                         time_to_maturity: float, volatility: float, risk_free_rate: float,
@@ -57,6 +203,10 @@ class GreeksCalculator:
         """
         Calculate complete Greeks for a single warrant
         
+        Pricer results are memoized on inputs rounded to _PRICE_DECIMALS
+        (prices) and _PARAM_DECIMALS (T, volatility, rates), so repeated
+        quotes are not re-priced.
+        
         Args:
             symbol: Warrant symbol
             underlying_price: Current underlying price
@@ -70,14 +220,14 @@ class GreeksCalculator:
         Returns:
             Greeks model with all sensitivities
         """
-        result = self.pricer.price_with_greeks(
-            S=underlying_price,
-            K=strike_price,
-            T=time_to_maturity,
-            sigma=volatility,
-            r=risk_free_rate,
-            option_type=option_type,
-            q=dividend_yield
+        result = self._price_cached(
+            round(underlying_price, _PRICE_DECIMALS),
+            round(strike_price, _PRICE_DECIMALS),
+            round(time_to_maturity, _PARAM_DECIMALS),
+            round(volatility, _PARAM_DECIMALS),
+            round(risk_free_rate, _PARAM_DECIMALS),
+            option_type,
+            round(dividend_yield, _PARAM_DECIMALS)
         )
         
         # Calculate lambda (elasticity)
@@ -107,6 +257,10 @@ class GreeksCalculator:
             }
         )
     
+    def clear_greeks_cache(self) -> None:
+        """Drop memoized calculate_greeks results (call after changing pricer configuration)"""
+        self._price_cached.cache_clear()
+    
     def calculate_portfolio_greeks(self, positions: List[Dict]) -> PortfolioGreeks:
         """
         Calculate aggregated Greeks for a portfolio of warrants
@@ -117,64 +271,61 @@ class GreeksCalculator:
         Returns:
             PortfolioGreeks with aggregated sensitivities
         """
-        total_delta = 0.0
-        total_gamma = 0.0
-        total_vega = 0.0
-        total_theta = 0.0
-        total_rho = 0.0
-        
-        delta_exposure = 0.0
-        gamma_exposure = 0.0
-        vega_exposure = 0.0
-        
-        total_value = 0.0
-        notional_exposure = 0.0
+        return self._aggregate_portfolio(_extract_positions_arrays(positions))
+    
+    def calculate_portfolio_greeks_df(self, df: pd.DataFrame) -> PortfolioGreeks:
+        """
+        Calculate aggregated Greeks for a portfolio held as a DataFrame
         
-        long_positions = 0
-        short_positions = 0
+        Each field is read with one to_numpy() call instead of a dictionary
+        lookup per position. Optional columns (risk_free_rate, dividend_yield,
+        quantity, option_price, option_type) take the same defaults as in
+        calculate_portfolio_greeks.
         
-        for position in positions:
-            quantity = position.get('quantity', 0)
-            
-            # Calculate Greeks for this position
-            greeks = self.calculate_greeks(
-                symbol=position['symbol'],
-                underlying_price=position['underlying_price'],
-                strike_price=position['strike_price'],
-                time_to_maturity=position['time_to_maturity'],
-                volatility=position['volatility'],
-                risk_free_rate=position.get('risk_free_rate', 0.04),
-                option_type=position.get('option_type', 'c'),
-                dividend_yield=position.get('dividend_yield', 0.0)
-            )
-            
-            # Aggregate Greeks
-            total_delta += greeks.delta * quantity
-            total_gamma += greeks.gamma * quantity
-            total_vega += greeks.vega * quantity
-            total_theta += greeks.theta * quantity
-            total_rho += greeks.rho * quantity
-            
-            # Calculate exposures
-            option_price = position.get('option_price', 0)
-            underlying_price = position['underlying_price']
-            
-            delta_exposure += greeks.delta * quantity * underlying_price
-            gamma_exposure += greeks.gamma * quantity * underlying_price * underlying_price
-            vega_exposure += greeks.vega * quantity
+        Args:
+            df: One row per position, columns named like the position dictionary keys
             
-            total_value += option_price * quantity
-            notional_exposure += underlying_price * quantity
+        Returns:
+            PortfolioGreeks with aggregated sensitivities
+        """
+        return self._aggregate_portfolio(_frame_to_arrays(df))
+    
+    def _aggregate_portfolio(self, arrays: Dict[str, np.ndarray]) -> PortfolioGreeks:
+        """
+        Price the book and reduce it to portfolio totals
+        
+        Args:
+            arrays: Position arrays from _extract_positions_arrays or _frame_to_arrays
             
-            # Count positions
-            if quantity > 0:
-                long_positions += 1
-            elif quantity < 0:
-                short_positions += 1
+        Returns:
+            PortfolioGreeks with aggregated sensitivities
+        """
+        S = arrays['underlying_price']
+        quantity = arrays['quantity']
+        
+        # Price the whole book in one vectorized call
+        result = self._price_book(arrays)
+        
+        # Aggregate Greeks, portfolio value and notional in one matrix-vector product
+        per_unit = np.stack((result.delta, result.gamma, result.vega, result.theta,
+                             result.rho, arrays['option_price'], S))
+        (total_delta, total_gamma, total_vega, total_theta, total_rho,
+         total_value, notional_exposure) = (per_unit @ quantity).tolist()
+        
+        # Calculate exposures
+        quantity_S = quantity * S
+        delta_exposure = float(result.delta @ quantity_S)
+        gamma_exposure = float(result.gamma @ (quantity_S * S))
+        vega_exposure = total_vega
         
+        # Count positions
+        long_positions = int(np.count_nonzero(quantity > 0))
+        short_positions = int(np.count_nonzero(quantity < 0))
+        
+        now = datetime.now()
         return PortfolioGreeks(
-            portfolio_id=f"portfolio_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
-            timestamp=datetime.now(),
+            portfolio_id=f"portfolio_{_pf_epoch}_{next(_pf_seq)}",
+            timestamp=now,
             total_delta=total_delta,
             total_gamma=total_gamma,
             total_vega=total_vega,
@@ -183,13 +334,56 @@ class GreeksCalculator:
             delta_exposure=delta_exposure,
             gamma_exposure=gamma_exposure,
             vega_exposure=vega_exposure,
-            number_of_positions=len(positions),
+            number_of_positions=len(quantity),
             long_positions=long_positions,
             short_positions=short_positions,
             total_portfolio_value=total_value,
             notional_exposure=notional_exposure
         )
     
+    def _price_book(self, arrays: Dict[str, np.ndarray]) -> BSBatchResult:
+        """
+        Price every position, splitting large books across threads
+        
+        With the torch backend the whole book goes to the device in one call.
+        The JIT pricer already runs on all cores, so threads are only used
+        for the NumPy fallback on books bigger than _THREAD_CHUNK.
+        
+        Args:
+            arrays: Position arrays from _extract_positions_arrays
+            
+        Returns:
+            BSBatchResult aligned with the input positions; price is left
+            None because portfolio value comes from the quoted option_price
+        """
+        fields = ('underlying_price', 'strike_price', 'time_to_maturity', 'volatility',
+                  'risk_free_rate', 'dividend_yield', 'cp')
+        n = len(arrays['cp'])
+        
+        if self.backend == 'torch':
+            _, delta, gamma, vega, theta, rho = bs_price_greeks_torch(*(arrays[f] for f in fields))
+            # Same units as the pricer: vega/rho per 1%, theta per day
+            return BSBatchResult(None, delta, gamma, vega / 100, theta / 365, rho / 100)
+        
+        if PRICER_JIT_AVAILABLE or n <= _THREAD_CHUNK:
+            return self.pricer.price_with_greeks_batch(*(arrays[f] for f in fields), include_price=False)
+        
+        bounds = range(0, n, _THREAD_CHUNK)
+        
+        def price_chunk(start: int) -> BSBatchResult:
+            end = start + _THREAD_CHUNK
+            return self.pricer.price_with_greeks_batch(
+                *(arrays[f][start:end] for f in fields), include_price=False
+            )
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(bounds))) as executor:
+            chunks = list(executor.map(price_chunk, bounds))
+        
+        return BSBatchResult(None, *(
+            np.concatenate([getattr(chunk, name) for chunk in chunks])
+            for name in ('delta', 'gamma', 'vega', 'theta', 'rho')
+        ))
+    
     def analyze_gamma_risk(self, symbol: str, current_gamma: float, 
                           underlying_price: float, position_size: int,
                           price_shocks: List[float] = None) -> GammaRiskAnalysis:
@@ -211,24 +405,17 @@ class GreeksCalculator:
         
         gamma_dollars = current_gamma * position_size * underlying_price
         
-        # Calculate gamma P&L for each scenario
-        gamma_pnl_scenarios = []
-        for shock in price_shocks:
-            price_change = underlying_price * shock
-            gamma_pnl = 0.5 * current_gamma * (price_change ** 2) * position_size
-            gamma_pnl_scenarios.append(gamma_pnl)
-        
-        max_gamma_loss = min(gamma_pnl_scenarios)
-        
-        # Assess risk level
-        if abs(gamma_dollars) < 1000:
-            risk_level = RiskLevel.LOW
-        elif abs(gamma_dollars) < 10000:
-            risk_level = RiskLevel.MEDIUM
-        elif abs(gamma_dollars) < 50000:
-            risk_level = RiskLevel.HIGH
-        else:
-            risk_level = RiskLevel.CRITICAL
+        # Calculate gamma P&L for every scenario at once
+        shocks = np.asarray(price_shocks, dtype=np.float64)
+        gamma_pnl = (0.5 * current_gamma * position_size * underlying_price ** 2) * shocks ** 2
+        gamma_pnl_scenarios = gamma_pnl.tolist()
+        
+        max_gamma_loss = float(gamma_pnl.min())
+        
+        # Assess risk level (a bound itself belongs to the higher level)
+        risk_level = _RISK_LEVELS[
+            np.searchsorted(_GAMMA_DOLLAR_BOUNDS, abs(gamma_dollars), side='right')
+        ]
         
         # Generate recommendations
         recommendations = []
@@ -276,57 +463,40 @@ class GreeksCalculator:
         Returns:
             GreeksEvolution showing Greeks over time
         """
-        time_to_expiry_days = np.linspace(current_maturity_days, 0, time_steps).tolist()
-        
-        delta_evolution = []
-        gamma_evolution = []
-        vega_evolution = []
-        theta_evolution = []
+        days_arr = np.linspace(current_maturity_days, 0, time_steps)
+        days_int = days_arr.astype(int)
         
-        for days in time_to_expiry_days:
-            T = days / 365.0
-            if T < 0.001:  # Near expiration
-                T = 0.001
-            
-            result = self.pricer.price_with_greeks(
-                S=underlying_price,
-                K=strike_price,
-                T=T,
-                sigma=volatility,
-                r=risk_free_rate,
-                option_type=option_type,
-                q=dividend_yield
-            )
-            
-            delta_evolution.append(result.delta)
-            gamma_evolution.append(result.gamma)
-            vega_evolution.append(result.vega)
-            theta_evolution.append(result.theta)
+        # Only T varies along the path, so price every step in one batch call.
+        # Near expiration T is floored at 0.001 years.
+        self.pricer._validate_inputs(underlying_price, strike_price, 0.0, volatility, risk_free_rate)
+        T_arr = np.clip(days_arr / 365.0, 0.001, None)
+        cp = 1.0 if option_type.lower() == 'c' else -1.0
+        result = self.pricer.price_with_greeks_batch(
+            underlying_price, strike_price, T_arr, volatility,
+            risk_free_rate, dividend_yield, cp, include_price=False
+        )
         
         # Find key inflection points
-        gamma_peak_idx = np.argmax(gamma_evolution)
-        gamma_peak_day = int(time_to_expiry_days[gamma_peak_idx])
-        
-        theta_accel_idx = np.argmin(theta_evolution)
-        theta_acceleration_day = int(time_to_expiry_days[theta_accel_idx])
+        gamma_peak_day = int(days_int[np.argmax(result.gamma)])
+        theta_acceleration_day = int(days_int[np.argmin(result.theta)])
         
         # Identify high risk periods
-        high_gamma_threshold = np.percentile(gamma_evolution, 75)
-        high_gamma_periods = [int(days) for days, gamma in zip(time_to_expiry_days, gamma_evolution) 
-                             if gamma > high_gamma_threshold]
+        high_gamma_threshold = np.percentile(result.gamma, 75)
+        high_gamma_periods = days_int[result.gamma > high_gamma_threshold].tolist()
         
-        high_theta_threshold = np.percentile([abs(t) for t in theta_evolution], 75)
-        high_theta_periods = [int(days) for days, theta in zip(time_to_expiry_days, theta_evolution) 
-                             if abs(theta) > high_theta_threshold]
+        abs_theta = np.abs(result.theta)
+        high_theta_threshold = np.percentile(abs_theta, 75)
+        high_theta_periods = days_int[abs_theta > high_theta_threshold].tolist()
         
+        # Arrays stay NumPy until the model is built
         return GreeksEvolution(
             symbol=symbol,
             calculation_date=datetime.now(),
-            time_to_expiry_days=[int(d) for d in time_to_expiry_days],
-            delta_evolution=delta_evolution,
-            gamma_evolution=gamma_evolution,
-            vega_evolution=vega_evolution,
-            theta_evolution=theta_evolution,
+            time_to_expiry_days=days_int.tolist(),
+            delta_evolution=result.delta.tolist(),
+            gamma_evolution=result.gamma.tolist(),
+            vega_evolution=result.vega.tolist(),
+            theta_evolution=result.theta.tolist(),
             gamma_peak_day=gamma_peak_day,
             theta_acceleration_day=theta_acceleration_day,
             high_gamma_periods=high_gamma_periods,
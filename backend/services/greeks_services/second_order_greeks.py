@@ -1,5 +1,5 @@
 """
-Second-Order Greeks Calculator using py_vollib
+Second-Order Greeks Calculator
 Advanced risk sensitivities for warrant hedging and risk management
 
 Second-Order Greeks:
@@ -19,20 +19,37 @@ from typing import Dict, Optional
 from datetime import datetime
 import logging
 
+from scipy.special import ndtr
+
+# Compiled price/Greeks kernel, with the NumPy implementation below as fallback
 try:
-    from py_vollib.black_scholes import black_scholes as bs_price
-    from py_vollib.black_scholes.greeks import analytical as greeks
-    VOLLIB_AVAILABLE = True
+    from ._bs_cy import all_greeks as _all_greeks_cy
+    CYTHON_AVAILABLE = True
 except ImportError:
-    VOLLIB_AVAILABLE = False
-    logging.warning("py_vollib not available. Install with: pip install py_vollib")
+    CYTHON_AVAILABLE = False
+
+# Numba-compiled equivalent, used when the Cython module is not built
+try:
+    from . import _kernels
+except ImportError:
+    import _kernels  # run as a script from this directory
 
 logger = logging.getLogger(__name__)
 
+_GREEK_FIELDS = ('price', 'delta', 'gamma', 'vega', 'theta', 'rho',
+                 'vanna', 'volga', 'charm', 'veta')
+
+_RSQRT2PI = 0.3989422804014327  # 1 / sqrt(2π)
+
+
+def _phi(x):
+    """Standard normal PDF without the scipy.stats dispatch overhead"""
+    return _RSQRT2PI * np.exp(-0.5 * x * x)
+
 
 class SecondOrderGreeksCalculator:
     """
-    Calculate second-order Greeks using py_vollib analytical formulas
+    Calculate second-order Greeks using closed-form Black-Scholes formulas
     
     Theory:
     - Vanna = ∂Δ/∂σ = ∂ν/∂S: Critical for delta-hedging when vol changes
@@ -48,11 +65,6 @@ class SecondOrderGreeksCalculator:
     
     def __init__(self):
         """Initialize second-order Greeks calculator"""
-        if not VOLLIB_AVAILABLE:
-            raise ImportError(
-                "py_vollib is required for second-order Greeks. "
-                "Install with: pip install py_vollib"
-            )
         logger.info("SecondOrderGreeksCalculator initialized")
     
     def calculate_all_greeks(self,
@@ -79,44 +91,95 @@ class SecondOrderGreeksCalculator:
             Dictionary with all Greeks (first and second-order)
         """
         flag = option_type.lower()[0]  # 'c' or 'p'
-        
-        # First-order Greeks (from py_vollib)
-        # Note: py_vollib doesn't support q parameter in Greeks, adjust S for dividends
-        S_adj = S * np.exp(-q * T) if q != 0 else S
-        
-        delta = greeks.delta(flag, S_adj, K, T, r, sigma)
-        gamma = greeks.gamma(flag, S_adj, K, T, r, sigma)
-        vega = greeks.vega(flag, S_adj, K, T, r, sigma)
-        theta = greeks.theta(flag, S_adj, K, T, r, sigma)
-        rho = greeks.rho(flag, S_adj, K, T, r, sigma)
-        
-        # Second-order Greeks
-        vanna = self.calculate_vanna(flag, S, K, T, r, sigma, q)
-        volga = self.calculate_volga(flag, S, K, T, r, sigma, q)
-        charm = self.calculate_charm(flag, S, K, T, r, sigma, q)
-        veta = self.calculate_veta(flag, S, K, T, r, sigma, q)
-        
-        # Price
-        price = bs_price(flag, S_adj, K, T, r, sigma)
+        g = self._compute_all_greeks_fused(S, K, T, r, sigma, q, flag)
         
         return {
-            'price': price,
+            'price': g['price'],
             'first_order': {
-                'delta': delta,
-                'gamma': gamma,
-                'vega': vega / 100,  # py_vollib returns vega per 100% vol move
-                'theta': theta / 365,  # py_vollib returns theta per year
-                'rho': rho / 100  # py_vollib returns rho per 100% rate move
+                'delta': g['delta'],
+                'gamma': g['gamma'],
+                'vega': g['vega'] / 100,  # Scale to per 1% vol move
+                'theta': g['theta'] / 365,  # Convert to per-day
+                'rho': g['rho'] / 100  # Scale to per 1% rate move
             },
             'second_order': {
-                'vanna': vanna,
-                'volga': volga,
-                'charm': charm,
-                'veta': veta
+                'vanna': g['vanna'],
+                'volga': g['volga'] / 10000,  # Scale to per 1% vol move
+                'charm': g['charm'] / 365,  # Convert to per-day
+                'veta': g['veta'] / 365  # Convert to per-day
             },
             'timestamp': datetime.now()
         }
     
+    def _compute_all_greeks_fused(self, S: float, K: float, T: float, r: float,
+                                  sigma: float, q: float, flag: str) -> Dict[str, float]:
+        """
+        Price plus first and second-order Greeks from one set of shared terms
+        
+        d1, d2, √T, e^(-qT), e^(-rT), φ(d1) and the normal CDFs are evaluated
+        once and every Greek is an algebraic combination of them. All
+        Greeks are Black-Scholes-Merton sensitivities to S with dividend yield q.
+        
+        Args:
+            S, K, T, r, sigma, q: Black-Scholes parameters
+            flag: 'c' for call, anything else for put
+            
+        Returns:
+            Dictionary of raw Greeks (vega/rho per 1.0, theta/charm/veta per year,
+            volga per 1.0 vol squared)
+        """
+        if CYTHON_AVAILABLE:
+            return dict(zip(_GREEK_FIELDS, _all_greeks_cy(
+                float(S), float(K), float(T), float(r), float(sigma), float(q), flag == 'c'
+            )))
+        
+        cp = 1.0 if flag == 'c' else -1.0
+        
+        if _kernels.NUMBA_AVAILABLE:
+            return dict(zip(_GREEK_FIELDS, _kernels.bs_all_greeks(
+                float(S), float(K), float(T), float(r), float(sigma), float(q), cp
+            )))
+        
+        if T <= 0:
+            delta = (1.0 if S > K else 0.0) if cp > 0 else (-1.0 if S <= K else 0.0)
+            return {
+                'price': max(cp * (S - K), 0.0), 'delta': delta, 'gamma': 0.0,
+                'vega': 0.0, 'theta': 0.0, 'rho': 0.0,
+                'vanna': 0.0, 'volga': 0.0, 'charm': 0.0, 'veta': 0.0
+            }
+        
+        sqrtT = np.sqrt(T)
+        sigma_sqrtT = sigma * sqrtT
+        d1 = (np.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sigma_sqrtT
+        d2 = d1 - sigma_sqrtT
+        
+        emqT = np.exp(-q * T)
+        emrT = np.exp(-r * T)
+        phi_d1 = _phi(d1)
+        Phi_d1 = ndtr(cp * d1)
+        Phi_d2 = ndtr(cp * d2)
+        
+        emqT_Phi_d1 = emqT * Phi_d1
+        K_disc_Phi_d2 = K * emrT * Phi_d2
+        emqT_phi_d1 = emqT * phi_d1
+        vega = S * emqT_phi_d1 * sqrtT
+        
+        return {
+            'price': float(cp * (S * emqT_Phi_d1 - K_disc_Phi_d2)),
+            'delta': float(cp * emqT_Phi_d1),
+            'gamma': float(emqT_phi_d1 / (S * sigma_sqrtT)),
+            'vega': float(vega),
+            'theta': float(-S * emqT_phi_d1 * sigma / (2.0 * sqrtT)
+                           - cp * (r * K_disc_Phi_d2 - q * S * emqT_Phi_d1)),
+            'rho': float(cp * T * K_disc_Phi_d2),
+            'vanna': float(-emqT_phi_d1 * d2 / sigma),
+            'volga': float(vega * d1 * d2 / sigma),
+            'charm': float(-cp * q * emqT_Phi_d1
+                           + emqT_phi_d1 * (2.0 * (r - q) * T - d2 * sigma_sqrtT)
+                           / (2.0 * T * sigma_sqrtT)),
+            'veta': float(-vega * (q + (r - q) * d1 / sigma_sqrtT - (1.0 + d1 * d2) / (2.0 * T)))
+        }
+    
     def calculate_vanna(self, flag: str, S: float, K: float, T: float, 
                        r: float, sigma: float, q: float = 0.0) -> float:
         """
@@ -142,17 +205,7 @@ class SecondOrderGreeksCalculator:
         Returns:
             Vanna value
         """
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        # Standard normal PDF
-        phi_d1 = (1.0 / np.sqrt(2.0 * np.pi)) * np.exp(-0.5 * d1 ** 2)
-        
-        # Vanna formula (same for calls and puts)
-        vanna = -np.exp(-q * T) * phi_d1 * d2 / sigma
-        
-        return vanna
+        return self._compute_all_greeks_fused(S, K, T, r, sigma, q, flag)['vanna']
     
     def calculate_volga(self, flag: str, S: float, K: float, T: float,
                        r: float, sigma: float, q: float = 0.0) -> float:
@@ -175,17 +228,7 @@ class SecondOrderGreeksCalculator:
         Returns:
             Volga value
         """
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        # Calculate vega first
-        phi_d1 = (1.0 / np.sqrt(2.0 * np.pi)) * np.exp(-0.5 * d1 ** 2)
-        vega = S * np.exp(-q * T) * phi_d1 * np.sqrt(T)
-        
-        # Volga formula
-        volga = vega * d1 * d2 / sigma
-        
+        volga = self._compute_all_greeks_fused(S, K, T, r, sigma, q, flag)['volga']
         return volga / 10000  # Scale to per 1% vol move
     
     def calculate_charm(self, flag: str, S: float, K: float, T: float,
@@ -213,26 +256,7 @@ class SecondOrderGreeksCalculator:
         Returns:
             Charm value (per day)
         """
-        from scipy.stats import norm
-        
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        phi_d1 = norm.pdf(d1)
-        Phi_d1 = norm.cdf(d1)
-        Phi_minus_d1 = norm.cdf(-d1)
-        
-        # Common term
-        common_term = np.exp(-q * T) * phi_d1 * (
-            2 * (r - q) * T - d2 * sigma * np.sqrt(T)
-        ) / (2 * T * sigma * np.sqrt(T))
-        
-        if flag == 'c':
-            charm = -q * np.exp(-q * T) * Phi_d1 + common_term
-        else:  # put
-            charm = q * np.exp(-q * T) * Phi_minus_d1 + common_term
-        
+        charm = self._compute_all_greeks_fused(S, K, T, r, sigma, q, flag)['charm']
         return charm / 365  # Convert to per-day
     
     def calculate_veta(self, flag: str, S: float, K: float, T: float,
@@ -256,17 +280,7 @@ class SecondOrderGreeksCalculator:
         Returns:
             Veta value (per day)
         """
-        # Calculate d1 and d2
-        d1 = (np.log(S / K) + (r - q + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
-        d2 = d1 - sigma * np.sqrt(T)
-        
-        phi_d1 = (1.0 / np.sqrt(2.0 * np.pi)) * np.exp(-0.5 * d1 ** 2)
-        
-        # Veta formula (same for calls and puts)
-        veta = -S * np.exp(-q * T) * phi_d1 * np.sqrt(T) * (
-            q + ((r - q) * d1) / (sigma * np.sqrt(T)) - (1 + d1 * d2) / (2 * T)
-        )
-        
+        veta = self._compute_all_greeks_fused(S, K, T, r, sigma, q, flag)['veta']
         return veta / 365  # Convert to per-day
     
     def taylor_series_pnl(self,
@@ -10,15 +10,129 @@ Based on delta_hedging_jupyter.ipynb with enhancements:
 - Performance analysis and inverse square root law validation
 """
 
+import math
+import multiprocessing
 import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 import logging
 
+try:
+    import numba
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+try:
+    import numexpr as ne
+    NUMEXPR_AVAILABLE = True
+except ImportError:
+    NUMEXPR_AVAILABLE = False
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Paths handled together by one thread; keeps each time step's reads contiguous
+_PATH_BLOCK = 64
+_SQRT1_2 = 0.7071067811865476
+# Upper bound on rebalancing frequencies simulated concurrently
+_MAX_WORKERS = 8
+# Grid size above which numexpr's threaded, blocked evaluation beats NumPy for the GBM increments.
+# Single-threaded, numexpr's exp is slower than NumPy's SIMD exp, so it is only used with 2+ threads
+_NUMEXPR_MIN_SIZE = 100_000
+# Numba's on-disk cache records the importing module's name, so only the name
+# the app uses reads and writes it (see black_scholes_pricer); parallel
+# kernels are never cached
+_NUMBA_CACHE = __name__.startswith('services.')
+
+
+if NUMBA_AVAILABLE:
+    @njit(fastmath=True, parallel=True, nogil=True)
+    def _simulate_gbm_numba(S0, drift_dt, sigma_sqrt_dt, z):
+        """GBM paths of shape (len(z) + 1, n_paths), in the dtype of the standard normal shocks z"""
+        n_steps = z.shape[0] + 1
+        n_paths = z.shape[1]
+        paths = np.empty((n_steps, n_paths), dtype=z.dtype)
+        n_blocks = (n_paths + _PATH_BLOCK - 1) // _PATH_BLOCK
+        
+        for b in prange(n_blocks):
+            start = b * _PATH_BLOCK
+            end = min(start + _PATH_BLOCK, n_paths)
+            for p in range(start, end):
+                paths[0, p] = S0
+            for i in range(1, n_steps):
+                for p in range(start, end):
+                    paths[i, p] = paths[i - 1, p] * math.exp(drift_dt + sigma_sqrt_dt * z[i - 1, p])
+        
+        return paths
+    
+    @njit(cache=_NUMBA_CACHE, fastmath=True, nogil=True)
+    def _bs_delta_numba(S, K, T, sigma, r, q, cp):
+        """Black-Scholes-Merton delta of a call (cp=1) or put (cp=-1)"""
+        sig_sqrt_t = sigma * math.sqrt(T)
+        d1 = (math.log(S / K) + (r - q + 0.5 * sigma * sigma) * T) / sig_sqrt_t
+        return cp * math.exp(-q * T) * 0.5 * (1.0 + math.erf(cp * d1 * _SQRT1_2))
+    
+    @njit(fastmath=True, parallel=True, nogil=True)
+    def _simulate_and_hedge(S0, K, T, sigma, r, q, mu, dt, n_steps, path_seeds, cost_rate, cp, antithetic):
+        """
+        Simulate GBM paths and delta-hedge them in one pass
+        
+        Each path streams its price, delta, hedging P&L and trading cost as
+        scalars, so memory is O(n_paths) rather than O(n_steps * n_paths).
+        Path p draws its shocks from its own stream seeded with path_seeds[p],
+        so results do not depend on how paths are split across threads. With
+        antithetic, odd path 2k+1 replays the stream of path 2k with negated shocks.
+        
+        Returns:
+            (hedging P&L, transaction costs, option payoff, final delta), one entry per path
+        """
+        drift_dt = (mu - 0.5 * sigma * sigma) * dt
+        sigma_sqrt_dt = sigma * math.sqrt(dt)
+        n_paths = path_seeds.shape[0]
+        hedge_pnl = np.empty(n_paths)
+        costs = np.empty(n_paths)
+        payoff = np.empty(n_paths)
+        final_delta = np.empty(n_paths)
+        
+        for p in prange(n_paths):
+            if antithetic and p % 2 == 1:
+                np.random.seed(path_seeds[p - 1])
+                sign = -1.0
+            else:
+                np.random.seed(path_seeds[p])
+                sign = 1.0
+            S = S0
+            delta = _bs_delta_numba(S, K, T, sigma, r, q, cp)
+            pnl_acc = 0.0
+            cost_acc = 0.0
+            for i in range(1, n_steps):
+                S_new = S * math.exp(drift_dt + sign * sigma_sqrt_dt * np.random.standard_normal())
+                pnl_acc -= delta * (S_new - S)
+                new_delta = _bs_delta_numba(S_new, K, T - i * dt, sigma, r, q, cp)
+                cost_acc += abs(new_delta - delta) * S_new * cost_rate
+                delta = new_delta
+                S = S_new
+            hedge_pnl[p] = pnl_acc
+            costs[p] = cost_acc
+            payoff[p] = max(cp * (S - K), 0.0)
+            final_delta[p] = delta
+        
+        return hedge_pnl, costs, payoff, final_delta
+    
+    # Compile (or load from the on-disk cache) at import, not on the first request
+    _simulate_gbm_numba(1.0, 0.0, 0.0, np.zeros((1, 1)))
+    _simulate_gbm_numba(np.float32(1.0), np.float32(0.0), np.float32(0.0), np.zeros((1, 1), dtype=np.float32))
+    _simulate_and_hedge(1.0, 1.0, 1.0, 0.2, 0.0, 0.0, 0.0, 0.5, 2, np.zeros(1, dtype=np.uint32), 0.0, 1.0, False)
+    
+    # The workqueue threading layer aborts if parallel kernels are launched from several threads
+    _CONCURRENT_KERNELS = numba.threading_layer() != 'workqueue'
+else:
+    _CONCURRENT_KERNELS = False
+
 
 class DynamicDeltaHedgingEngine:
     '''
@@ -35,7 +149,8 @@ class DynamicDeltaHedgingEngine:
                  pricer,
                  transaction_cost: float = 0.00156,  # 0.156% VN market
                  slippage: float = 0.0005,           # 0.05% slippage
-                 use_vn_config: bool = True):
+                 use_vn_config: bool = True,
+                 seed: Optional[int] = None):
         '''
         Initialize hedging engine
         
@@ -44,11 +159,13 @@ class DynamicDeltaHedgingEngine:
             transaction_cost: Transaction cost per trade (default VN: 0.156%)
             slippage: Slippage per trade (default: 0.05%)
             use_vn_config: Use Vietnamese market parameters
+            seed: Seed of the engine's random generator (default: fresh OS entropy)
         '''
         self.pricer = pricer
         self.transaction_cost = transaction_cost
         self.slippage = slippage
         self.use_vn_config = use_vn_config
+        self._rng = np.random.default_rng(seed)
         
         logger.info(f'DynamicDeltaHedgingEngine initialized')
         logger.info(f'  Transaction cost: {transaction_cost*100:.3f}%')
@@ -60,7 +177,9 @@ class DynamicDeltaHedgingEngine:
                            sigma: float, 
                            mu: float = 0.0,
                            rebal_freq: float = 1/252,
-                           n_paths: int = 1) -> pd.DataFrame:
+                           n_paths: int = 1,
+                           dtype=np.float64,
+                           antithetic: bool = False) -> pd.DataFrame:
         '''
         Simulate underlying price paths using Geometric Brownian Motion
         
@@ -71,37 +190,87 @@ class DynamicDeltaHedgingEngine:
             mu: Drift (default 0 for risk-neutral)
             rebal_freq: Rebalancing frequency (years)
             n_paths: Number of simulation paths
+            dtype: Floating type of the paths; np.float32 halves memory traffic
+                at ~7 significant digits, enough for P&L statistics
+            antithetic: Pair each path with its mirror (same shocks, negated);
+                path 2k+1 mirrors path 2k
             
         Returns:
             DataFrame with simulated price paths
         '''
+        paths, time_steps = self._simulate_price_path_array(S0, T, sigma, mu, rebal_freq, n_paths, dtype, antithetic)
+        
+        # Create DataFrame
+        df = pd.DataFrame(
+            paths,
+            index=time_steps,
+            columns=[f'Path_{i+1}' for i in range(n_paths)]
+        )
+        
+        return df
+    
+    def _simulate_price_path_array(self,
+                                   S0: float,
+                                   T: float,
+                                   sigma: float,
+                                   mu: float = 0.0,
+                                   rebal_freq: float = 1/252,
+                                   n_paths: int = 1,
+                                   dtype=np.float64,
+                                   antithetic: bool = False,
+                                   rng: Optional[np.random.Generator] = None) -> Tuple[np.ndarray, np.ndarray]:
+        '''
+        simulate_price_path without the DataFrame wrapper, for internal callers;
+        shocks come from rng when given, else from the engine's generator
+        
+        Returns:
+            (paths of shape (n_steps, n_paths), time to maturity of each step)
+        '''
         # Time steps
         time_steps = np.arange(start=T, stop=0.0, step=-rebal_freq)
         n_steps = len(time_steps)
         
-        # Initialize price paths
-        paths = np.zeros((n_steps, n_paths))
-        paths[0, :] = S0
-        
         # Daily volatility
         dt = rebal_freq
         drift_adj = mu - 0.5 * sigma**2  # Drift adjustment
         
         # Generate random shocks
-        z = np.random.standard_normal((n_steps-1, n_paths))
+        rng = self._rng if rng is None else rng
+        if antithetic:
+            z_half = rng.standard_normal((n_steps-1, (n_paths + 1) // 2), dtype=dtype)
+            z = np.empty((n_steps-1, n_paths), dtype=dtype)
+            z[:, 0::2] = z_half
+            np.negative(z_half[:, :n_paths // 2], out=z[:, 1::2])
+        else:
+            z = rng.standard_normal((n_steps-1, n_paths), dtype=dtype)
         
-        # Simulate paths
-        for i in range(1, n_steps):
-            paths[i, :] = paths[i-1, :] * np.exp(drift_adj * dt + sigma * np.sqrt(dt) * z[i-1, :])
+        # Loop-invariant per-step drift and volatility
+        mu_dt = drift_adj * dt
+        vol_sqrt_dt = sigma * math.sqrt(dt)
         
-        # Create DataFrame
-        df = pd.DataFrame(
-            paths,
-            index=time_steps,
-            columns=[f'Path_{i+1}' for i in range(n_paths)]
-        )
+        # Simulate paths
+        if NUMBA_AVAILABLE:
+            # Scalars in the paths' dtype keep float32 arithmetic from promoting to float64
+            scalar = np.dtype(dtype).type
+            paths = _simulate_gbm_numba(scalar(S0), scalar(mu_dt), scalar(vol_sqrt_dt), z)
+        else:
+            # S_i = S_{i-1} * exp(mu_dt + vol_sqrt_dt * z_i) is a running product down the time axis:
+            # write S0 and the growth factors into paths, then accumulate in place
+            paths = np.empty((n_steps, n_paths), dtype=dtype)
+            paths[0, :] = S0
+            increments = paths[1:]
+            if NUMEXPR_AVAILABLE and z.size > _NUMEXPR_MIN_SIZE and ne.get_num_threads() > 1:
+                # One fused pass; scalars in the paths' dtype so numexpr does not upcast float32
+                scalar = np.dtype(dtype).type
+                ne.evaluate('exp(mu_dt + vol_sqrt_dt * z)', out=increments, casting='same_kind',
+                            local_dict={'mu_dt': scalar(mu_dt), 'vol_sqrt_dt': scalar(vol_sqrt_dt), 'z': z})
+            else:
+                np.multiply(z, vol_sqrt_dt, out=increments)
+                increments += mu_dt
+                np.exp(increments, out=increments)
+            np.cumprod(paths, axis=0, out=paths)
         
-        return df
+        return paths, time_steps
     
     def calculate_hedging_pnl(self,
                              price_paths: pd.DataFrame,
@@ -126,55 +295,60 @@ class DynamicDeltaHedgingEngine:
         Returns:
             Dictionary with hedging results
         '''
-        n_steps, n_paths = price_paths.shape
-        time_to_maturity = price_paths.index.values
-        
-        # Initialize arrays
-        deltas = np.zeros((n_steps, n_paths))
-        hedging_pnl = np.zeros((n_steps, n_paths))
-        transaction_costs = np.zeros((n_steps, n_paths))
-        
-        # Calculate deltas and hedging P&L
-        for i in range(n_steps):
-            T = time_to_maturity[i]
-            S = price_paths.iloc[i, :].values
-            
-            # Calculate delta at this step
-            if option_type == 'c':
-                deltas[i, :] = [self.pricer.call_delta(s, K, T, sigma, r, q) for s in S]
-            else:
-                deltas[i, :] = [self.pricer.put_delta(s, K, T, sigma, r, q) for s in S]
-            
-            # Calculate hedging P&L (from previous step)
-            if i > 0:
-                price_change = S - price_paths.iloc[i-1, :].values
-                hedging_pnl[i, :] = -deltas[i-1, :] * price_change
-                
-                # Calculate transaction costs
-                delta_change = np.abs(deltas[i, :] - deltas[i-1, :])
-                trade_size = delta_change * S
-                
-                # Transaction cost + slippage
-                transaction_costs[i, :] = trade_size * (self.transaction_cost + self.slippage)
+        paths = np.ascontiguousarray(price_paths.to_numpy())
+        return self._hedging_pnl_arrays(paths, price_paths.index.values, K, r, sigma, q, option_type)
+    
+    def _hedging_pnl_arrays(self,
+                            paths: np.ndarray,
+                            time_to_maturity: np.ndarray,
+                            K: float,
+                            r: float,
+                            sigma: float,
+                            q: float = 0.0,
+                            option_type: str = 'c') -> Dict:
+        '''
+        calculate_hedging_pnl on a (n_steps, n_paths) array and its time-to-maturity grid
+        '''
+        n_steps, n_paths = paths.shape
+        delta_vec = self.pricer.call_delta_vec if option_type == 'c' else self.pricer.put_delta_vec
+        
+        # Deltas for the whole (time step, path) grid in one broadcast
+        deltas = delta_vec(paths, K, time_to_maturity[:, None], sigma, r, q)
+        
+        # The four per-step grids share one allocation; each is a contiguous (n_steps, n_paths) view
+        block = np.empty((4, n_steps, n_paths))
+        hedging_pnl, hedging_pnl_cumsum, transaction_costs, transaction_costs_cumsum = block
+        
+        # Hedging P&L from holding the previous step's delta over each price move
+        hedging_pnl[0] = 0.0
+        np.subtract(paths[:-1], paths[1:], out=hedging_pnl[1:])
+        hedging_pnl[1:] *= deltas[:-1]
+        
+        # Transaction cost + slippage on each rebalancing trade
+        transaction_costs[0] = 0.0
+        np.subtract(deltas[1:], deltas[:-1], out=transaction_costs[1:])
+        np.abs(transaction_costs[1:], out=transaction_costs[1:])
+        transaction_costs[1:] *= paths[1:]
+        transaction_costs[1:] *= self.transaction_cost + self.slippage
         
         # Calculate option payoff at expiration
-        final_prices = price_paths.iloc[-1, :].values
+        final_prices = paths[-1]
         if option_type == 'c':
             option_payoff = np.maximum(final_prices - K, 0)
         else:
             option_payoff = np.maximum(K - final_prices, 0)
         
         # Calculate total P&L
-        hedging_pnl_cumsum = np.cumsum(hedging_pnl, axis=0)
-        transaction_costs_cumsum = np.cumsum(transaction_costs, axis=0)
+        np.cumsum(hedging_pnl, axis=0, out=hedging_pnl_cumsum)
+        np.cumsum(transaction_costs, axis=0, out=transaction_costs_cumsum)
         
         # Total P&L = Hedging P&L - Transaction Costs + Option Payoff
         total_pnl = hedging_pnl_cumsum[-1, :] - transaction_costs_cumsum[-1, :] + option_payoff
         
         # Calculate initial option price
-        initial_price = self.pricer.call_price(price_paths.iloc[0, 0], K, time_to_maturity[0], sigma, r, q) \
+        initial_price = self.pricer.call_price(paths[0, 0], K, time_to_maturity[0], sigma, r, q) \
                        if option_type == 'c' else \
-                       self.pricer.put_price(price_paths.iloc[0, 0], K, time_to_maturity[0], sigma, r, q)
+                       self.pricer.put_price(paths[0, 0], K, time_to_maturity[0], sigma, r, q)
         
         return {
             'deltas': deltas,
@@ -188,6 +362,87 @@ class DynamicDeltaHedgingEngine:
             'returns': total_pnl / initial_price - 1
         }
     
+    def simulate_hedging_outcomes(self,
+                                  S0: float,
+                                  K: float,
+                                  T: float,
+                                  sigma: float,
+                                  r: float,
+                                  q: float = 0.0,
+                                  mu: float = 0.0,
+                                  rebal_freq: float = 1/252,
+                                  n_paths: int = 1000,
+                                  option_type: str = 'c',
+                                  seed: Optional[int] = None,
+                                  antithetic: bool = False) -> Dict:
+        '''
+        Simulate paths and hedge them, keeping only the per-path totals
+        
+        Same model as simulate_price_path followed by calculate_hedging_pnl,
+        but with Numba the simulation and hedging run as one fused kernel that
+        never stores the (n_steps, n_paths) grids.
+        
+        Args:
+            S0: Initial stock price
+            K: Strike price
+            T: Time to maturity (years)
+            sigma: Volatility
+            r: Risk-free rate
+            q: Dividend yield
+            mu: Drift (default 0 for risk-neutral)
+            rebal_freq: Rebalancing frequency (years)
+            n_paths: Number of simulation paths
+            option_type: 'c' for call, 'p' for put
+            seed: Entropy for this run's random streams (default: drawn from
+                the engine's generator)
+            antithetic: Pair each path with its mirror (same shocks, negated)
+            
+        Returns:
+            Dictionary accepted by analyze_hedging_performance; the cumulative
+            and delta arrays hold only the final row, shape (1, n_paths)
+        '''
+        if not NUMBA_AVAILABLE:
+            rng = None if seed is None else np.random.default_rng(seed)
+            paths, time_steps = self._simulate_price_path_array(S0, T, sigma, mu, rebal_freq, n_paths,
+                                                                antithetic=antithetic, rng=rng)
+            results = self._hedging_pnl_arrays(paths, time_steps, K, r, sigma, q, option_type)
+            return {
+                'deltas': results['deltas'][-1:],
+                'hedging_pnl_cumsum': results['hedging_pnl_cumsum'][-1:],
+                'transaction_costs_cumsum': results['transaction_costs_cumsum'][-1:],
+                'option_payoff': results['option_payoff'],
+                'total_pnl': results['total_pnl'],
+                'initial_option_price': results['initial_option_price'],
+                'returns': results['returns']
+            }
+        
+        n_steps = len(np.arange(start=T, stop=0.0, step=-rebal_freq))
+        cp = 1.0 if option_type == 'c' else -1.0
+        if seed is None:
+            seed = int(self._rng.integers(2**63))
+        # Independent, well-mixed seed for each path's stream
+        path_seeds = np.random.SeedSequence(seed).generate_state(n_paths)
+        
+        hedge_pnl, costs, option_payoff, final_delta = _simulate_and_hedge(
+            float(S0), float(K), float(T), float(sigma), float(r), float(q), float(mu),
+            float(rebal_freq), n_steps, path_seeds, self.transaction_cost + self.slippage, cp, antithetic
+        )
+        total_pnl = hedge_pnl - costs + option_payoff
+        
+        initial_price = self.pricer.call_price(S0, K, T, sigma, r, q) \
+                       if option_type == 'c' else \
+                       self.pricer.put_price(S0, K, T, sigma, r, q)
+        
+        return {
+            'deltas': final_delta[None, :],
+            'hedging_pnl_cumsum': hedge_pnl[None, :],
+            'transaction_costs_cumsum': costs[None, :],
+            'option_payoff': option_payoff,
+            'total_pnl': total_pnl,
+            'initial_option_price': initial_price,
+            'returns': total_pnl / initial_price - 1
+        }
+    
     def analyze_hedging_performance(self, results: Dict) -> Dict:
         '''
         Analyze hedging performance
@@ -215,6 +470,23 @@ class DynamicDeltaHedgingEngine:
         
         return performance
     
+    def _analytic_hedge_error_std(self, S0, K, T, sigma, r, q, n_rebalances) -> float:
+        '''
+        Leading-order std of the discrete delta-hedging P&L (Derman-Kamal)
+        
+        std ≈ sqrt(π/4) * σ * Vega / sqrt(N), with Vega per 1.0 of volatility
+        at inception and N rebalances; equivalently Var ≈ π/4 * (S²σ²Γ)² * T * dt.
+        Transaction costs are not included.
+        '''
+        vega = self.pricer.vega(S0, K, T, sigma, r, q)
+        return math.sqrt(math.pi / 4) * sigma * vega / math.sqrt(n_rebalances)
+    
+    def _run_one_frequency(self, S0, K, T, sigma, r, q, rebal_freq, n_paths, seed, antithetic) -> Dict:
+        '''Simulate, hedge and analyze one rebalancing frequency of test_rebalancing_frequencies'''
+        # Only per-path totals are needed here
+        hedging_results = self.simulate_hedging_outcomes(S0, K, T, sigma, r, q, 0.0, rebal_freq, n_paths, 'c', seed, antithetic)
+        return self.analyze_hedging_performance(hedging_results)
+    
     def test_rebalancing_frequencies(self,
                                     S0: float,
                                     K: float,
@@ -223,7 +495,9 @@ class DynamicDeltaHedgingEngine:
                                     r: float,
                                     q: float = 0.0,
                                     frequencies: List[int] = None,
-                                    n_paths: int = 1000) -> pd.DataFrame:
+                                    n_paths: int = 1000,
+                                    antithetic: bool = True,
+                                    fast_mode: bool = False) -> pd.DataFrame:
         '''
         Test different rebalancing frequencies
         
@@ -238,37 +512,74 @@ class DynamicDeltaHedgingEngine:
             q: Dividend yield
             frequencies: List of rebalancing frequencies (times per day)
             n_paths: Number of simulation paths
+            antithetic: Simulate paths in antithetic pairs to reduce the
+                variance of the mean estimates
+            fast_mode: Skip the Monte Carlo and return only the closed-form
+                hedging-error curve (std_return_analytic)
             
         Returns:
-            DataFrame with results for each frequency
+            DataFrame with results for each frequency. std_return is the spread
+            of per-path returns; each antithetic path is still a valid draw, so
+            it estimates the same quantity with or without pairing.
+            std_return_analytic is the leading-order closed form, without costs
         '''
         if frequencies is None:
             frequencies = [1, 5, 10, 20, 50, 100]  # Times per day
         
-        results_list = []
+        rebal_freqs = [1 / (252 * freq_per_day) for freq_per_day in frequencies]  # Convert to years
+        
+        # Closed-form hedging-error std, as a fraction of the option premium like std_return
+        initial_price = self.pricer.call_price(S0, K, T, sigma, r, q)
+        analytic_std = [
+            self._analytic_hedge_error_std(S0, K, T, sigma, r, q, T / rebal_freq) / initial_price
+            for rebal_freq in rebal_freqs
+        ]
+        
+        if fast_mode:
+            results_df = pd.DataFrame({
+                'frequency_per_day': frequencies,
+                'rebalancing_interval_days': [1 / freq_per_day for freq_per_day in frequencies],
+                'std_return_analytic': analytic_std
+            })
+            results_df['inv_sqrt_freq'] = 1 / np.sqrt(results_df['frequency_per_day'])
+            return results_df
         
         for freq_per_day in frequencies:
-            rebal_freq = 1 / (252 * freq_per_day)  # Convert to years
-            
             logger.info(f'Testing frequency: {freq_per_day}x per day (every {1/freq_per_day:.2f} days)')
-            
-            # Simulate price paths
-            price_paths = self.simulate_price_path(S0, T, sigma, 0.0, rebal_freq, n_paths)
-            
-            # Calculate hedging P&L
-            hedging_results = self.calculate_hedging_pnl(price_paths, K, r, sigma, q, 'c')
-            
-            # Analyze performance
-            performance = self.analyze_hedging_performance(hedging_results)
-            
-            results_list.append({
+        
+        # Seeds are drawn up front, in order, so concurrent runs stay reproducible
+        seeds = [int(self._rng.integers(2**63)) for _ in frequencies]
+        
+        n_freqs = len(frequencies)
+        args = ([S0] * n_freqs, [K] * n_freqs, [T] * n_freqs, [sigma] * n_freqs, [r] * n_freqs, [q] * n_freqs,
+                rebal_freqs, [n_paths] * n_freqs, seeds, [antithetic] * n_freqs)
+        
+        if n_freqs > 1 and _CONCURRENT_KERNELS:
+            # The Numba kernel releases the GIL, so frequencies can run side by side in threads
+            with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, n_freqs)) as executor:
+                performances = list(executor.map(self._run_one_frequency, *args))
+        elif n_freqs > 1 and not NUMBA_AVAILABLE:
+            # The NumPy fallback holds the GIL, so the buckets go to worker processes. They are
+            # spawned rather than forked: forked children of a threaded parent can hang
+            with ProcessPoolExecutor(max_workers=min(_MAX_WORKERS, n_freqs),
+                                     mp_context=multiprocessing.get_context('spawn')) as executor:
+                performances = list(executor.map(self._run_one_frequency, *args))
+        else:
+            # One bucket, or Numba's workqueue layer, whose kernel already uses every core
+            performances = [self._run_one_frequency(*a) for a in zip(*args)]
+        
+        results_list = [
+            {
                 'frequency_per_day': freq_per_day,
                 'rebalancing_interval_days': 1 / freq_per_day,
                 'mean_return': performance['mean_return'],
                 'std_return': performance['std_return'],
                 'total_transaction_costs': performance['total_transaction_costs'],
-                'profitable_paths_pct': performance['profitable_paths'] * 100
-            })
+                'profitable_paths_pct': performance['profitable_paths'] * 100,
+                'std_return_analytic': std_analytic
+            }
+            for freq_per_day, performance, std_analytic in zip(frequencies, performances, analytic_std)
+        ]
         
         results_df = pd.DataFrame(results_list)
         
@@ -3,12 +3,16 @@ Market Data Service
 Fetches real-time market data from vnstock
 """
 import logging
-from typing import Optional, Dict, Any
+import time
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
+# Calendar days of daily history fetched per symbol; every method slices its window from it
+_HISTORY_WINDOW_DAYS = 60
+
 class MarketDataService:
     """Service for fetching real-time market data from vnstock"""
     
@@ -20,11 +24,55 @@ class MarketDataService:
             source: Data source (VCI or TCBS)
         """
         self.source = source
-        self.cache = {}  # Simple cache to avoid too many API calls
+        # Simple cache to avoid too many API calls: (symbol, source, kind[, ...]) -> (value, time.monotonic())
+        self.cache: Dict[Tuple, Tuple[Any, float]] = {}
         self.cache_duration = 60  # Cache for 60 seconds
+        # symbol -> (daily history, time.monotonic() of fetch, window in days), shared by all methods
+        self._history_cache: Dict[str, Tuple[pd.DataFrame, float, int]] = {}
         
         logger.info(f"Market Data Service initialized with source: {source}")
     
+    def _get_history(self, symbol: str, days: int) -> Optional[pd.DataFrame]:
+        """
+        Get the last `days` calendar days of daily history for a symbol
+        
+        One history request per symbol serves every method until it is
+        older than cache_duration or a longer window is asked for.
+        
+        Args:
+            symbol: Stock or warrant symbol
+            days: Calendar days of history needed
+            
+        Returns:
+            DataFrame slice of the cached history, or the (empty) response if none
+        """
+        now = datetime.now()
+        entry = self._history_cache.get(symbol)
+        
+        if entry is None or entry[2] < days or time.monotonic() - entry[1] >= self.cache_duration:
+            # Import vnstock here to avoid loading if not needed
+            from vnstock import Quote
+            
+            window = max(days, _HISTORY_WINDOW_DAYS)
+            quote = Quote(symbol=symbol, source=self.source)
+            df = quote.history(
+                start=(now - timedelta(days=window)).strftime('%Y-%m-%d'),
+                end=now.strftime('%Y-%m-%d')
+            )
+            
+            if df is None or df.empty:
+                return df
+            
+            entry = (df, time.monotonic(), window)
+            self._history_cache[symbol] = entry
+        
+        df = entry[0]
+        if 'time' not in df.columns:
+            return df
+        
+        start = pd.Timestamp((now - timedelta(days=days)).date())
+        return df[pd.to_datetime(df['time']) >= start]
+    
     def get_current_price(self, symbol: str) -> Optional[float]:
         """
         Get current/latest close price for a stock symbol
@@ -37,28 +85,14 @@ class MarketDataService:
         """
         try:
             # Check cache first
-            cache_key = f"{symbol}_{self.source}"
-            if cache_key in self.cache:
-                cached_data, cached_time = self.cache[cache_key]
-                if (datetime.now() - cached_time).seconds < self.cache_duration:
-                    logger.debug(f"Using cached price for {symbol}: {cached_data}")
-                    return cached_data
-            
-            # Import vnstock here to avoid loading if not needed
-            from vnstock import Quote
-            
-            # Get quote data
-            quote = Quote(symbol=symbol, source=self.source)
+            cache_key = (symbol, self.source, 'price')
+            entry = self.cache.get(cache_key)
+            if entry and time.monotonic() - entry[1] < self.cache_duration:
+                logger.debug(f"Using cached price for {symbol}: {entry[0]}")
+                return entry[0]
             
-            # Get last 2 days of data (in case today is weekend/holiday)
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=5)
-            
-            # Fetch historical data
-            df = quote.history(
-                start=start_date.strftime('%Y-%m-%d'),
-                end=end_date.strftime('%Y-%m-%d')
-            )
+            # Last 5 days of data (in case today is weekend/holiday)
+            df = self._get_history(symbol, 5)
             
             if df is None or df.empty:
                 logger.warning(f"No data returned for {symbol}")
@@ -69,7 +103,7 @@ class MarketDataService:
             latest_price = float(df['close'].iloc[-1]) * 1000  # Convert to VND
             
             # Cache the result
-            self.cache[cache_key] = (latest_price, datetime.now())
+            self.cache[cache_key] = (latest_price, time.monotonic())
             
             logger.info(f"Fetched current price for {symbol}: {latest_price:,.0f} VND")
             return latest_price
@@ -89,18 +123,8 @@ class MarketDataService:
             Dictionary with market data or None
         """
         try:
-            from vnstock import Quote
-            
-            quote = Quote(symbol=symbol, source=self.source)
-            
             # Get last 30 days for more context
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=30)
-            
-            df = quote.history(
-                start=start_date.strftime('%Y-%m-%d'),
-                end=end_date.strftime('%Y-%m-%d')
-            )
+            df = self._get_history(symbol, 30)
             
             if df is None or df.empty:
                 return None
@@ -171,26 +195,14 @@ class MarketDataService:
         """
         try:
             # Check cache first
-            cache_key = f"{warrant_symbol}_{self.source}_warrant"
-            if cache_key in self.cache:
-                cached_data, cached_time = self.cache[cache_key]
-                if (datetime.now() - cached_time).seconds < self.cache_duration:
-                    logger.debug(f"Using cached warrant price for {warrant_symbol}: {cached_data}")
-                    return cached_data
+            cache_key = (warrant_symbol, self.source, 'warrant')
+            entry = self.cache.get(cache_key)
+            if entry and time.monotonic() - entry[1] < self.cache_duration:
+                logger.debug(f"Using cached warrant price for {warrant_symbol}: {entry[0]}")
+                return entry[0]
             
-            from vnstock import Quote
-            
-            # Get warrant quote data
-            quote = Quote(symbol=warrant_symbol, source=self.source)
-            
-            # Get last 2 days of data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=5)
-            
-            df = quote.history(
-                start=start_date.strftime('%Y-%m-%d'),
-                end=end_date.strftime('%Y-%m-%d')
-            )
+            # Last 5 days of warrant quotes
+            df = self._get_history(warrant_symbol, 5)
             
             if df is None or df.empty:
                 logger.warning(f"No warrant price data for {warrant_symbol}")
@@ -200,7 +212,7 @@ class MarketDataService:
             warrant_price = float(df['close'].iloc[-1])
             
             # Cache the result
-            self.cache[cache_key] = (warrant_price, datetime.now())
+            self.cache[cache_key] = (warrant_price, time.monotonic())
             
             logger.info(f"Fetched warrant price for {warrant_symbol}: {warrant_price:,.2f} VND")
             return warrant_price
@@ -227,26 +239,16 @@ class MarketDataService:
         """
         try:
             import numpy as np
-            from vnstock import Quote
             
             # Check cache
-            cache_key = f"{symbol}_vol_{days}"
-            if cache_key in self.cache:
-                cached_data, cached_time = self.cache[cache_key]
-                if (datetime.now() - cached_time).seconds < self.cache_duration * 10:  # Cache vol longer
-                    logger.debug(f"Using cached volatility for {symbol}: {cached_data:.2%}")
-                    return cached_data
-            
-            quote = Quote(symbol=symbol, source=self.source)
+            cache_key = (symbol, self.source, 'vol', days)
+            entry = self.cache.get(cache_key)
+            if entry and time.monotonic() - entry[1] < self.cache_duration * 10:  # Cache vol longer
+                logger.debug(f"Using cached volatility for {symbol}: {entry[0]:.2%}")
+                return entry[0]
             
             # Get historical data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=days + 10)  # Extra days for safety
-            
-            df = quote.history(
-                start=start_date.strftime('%Y-%m-%d'),
-                end=end_date.strftime('%Y-%m-%d')
-            )
+            df = self._get_history(symbol, days + 10)  # Extra days for safety
             
             if df is None or len(df) < 10:
                 logger.warning(f"Insufficient data for volatility calculation: {symbol}")
@@ -255,8 +257,8 @@ class MarketDataService:
             # Calculate daily returns using log returns
             prices = df['close'].values
             
-            # Step 1: Calculate log returns
-            log_returns = np.log(prices[1:] / prices[:-1])
+            # Step 1: Calculate log returns (one log pass, one diff pass)
+            log_returns = np.diff(np.log(prices, dtype=np.float64))
             
             # Step 2 & 3: Calculate standard deviation (sample)
             daily_std = np.std(log_returns, ddof=1)  # ddof=1 for sample std
@@ -265,7 +267,7 @@ class MarketDataService:
             annualized_volatility = daily_std * np.sqrt(252)
             
             # Cache the result
-            self.cache[cache_key] = (annualized_volatility, datetime.now())
+            self.cache[cache_key] = (annualized_volatility, time.monotonic())
             
             logger.info(f"Calculated volatility for {symbol} ({len(log_returns)} days): {annualized_volatility:.2%}")
             return annualized_volatility
@@ -275,8 +277,9 @@ class MarketDataService:
             return None
     
     def clear_cache(self):
-        """Clear the price cache"""
+        """Clear the price and history caches"""
         self.cache = {}
+        self._history_cache = {}
         logger.info("Market data cache cleared")
 
 
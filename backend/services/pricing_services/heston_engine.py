@@ -1,44 +1,227 @@
 """
 Heston Stochastic Volatility Engine
-Currently uses Black-Scholes as fallback
-TODO: Implement full Heston model
+Carr-Madan FFT pricing from the Heston characteristic function
+
+One FFT prices a whole strike grid for a given maturity and parameter set;
+the resulting (spot-normalised) call curve is cached and interpolated, so
+pricing a chain of warrants on the same underlying and maturity costs one
+transform. Greeks are finite differences on the cached curve (delta, gamma)
+or on re-priced curves (vega, theta, rho).
 """
 
+import functools
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+import numpy as np
+from scipy.interpolate import CubicSpline
+
 from .black_scholes_pricer import BlackScholesPricer
 
+# Upper bound on pricing threads for one batch of warrants
+_MAX_WORKERS = 10
+
+# Carr-Madan grid: N points with spacing eta in the frequency domain,
+# damping factor alpha; log-strike spacing is 2*pi / (N * eta)
+_FFT_N = 4096
+_FFT_ETA = 0.25
+_FFT_ALPHA = 1.5
+
+# Relative bump sizes for the finite-difference Greeks
+_SPOT_BUMP = 0.01
+_VOL_BUMP = 0.01
+_RATE_BUMP = 1e-4
+_DAY = 1.0 / 365.0
+
+
+def _heston_cf(u: np.ndarray, T: float, kappa: float, theta: float, v0: float,
+               rho: float, sigma_v: float, r: float, q: float = 0.0) -> np.ndarray:
+    """
+    Characteristic function of ln(S_T / S_0) under the Heston model
+    
+    Uses the "little Heston trap" form (Albrecher et al.), which stays on the
+    principal branch of the complex logarithm for long maturities.
+    
+    Args:
+        u: Frequencies (complex array)
+        T: Time to maturity (years)
+        kappa: Mean-reversion speed of the variance
+        theta: Long-run variance
+        v0: Initial variance
+        rho: Spot/variance correlation
+        sigma_v: Volatility of variance
+        r: Risk-free rate
+        q: Dividend yield
+    
+    Returns:
+        Characteristic function values at u
+    """
+    iu = 1j * u
+    beta = kappa - rho * sigma_v * iu
+    d = np.sqrt(beta * beta + sigma_v * sigma_v * (iu + u * u))
+    g = (beta - d) / (beta + d)
+    exp_dT = np.exp(-d * T)
+    
+    C = (kappa * theta / sigma_v**2) * ((beta - d) * T - 2.0 * np.log((1.0 - g * exp_dT) / (1.0 - g)))
+    D = (beta - d) / sigma_v**2 * (1.0 - exp_dT) / (1.0 - g * exp_dT)
+    
+    return np.exp(C + D * v0 + iu * (r - q) * T)
+
+
+@functools.lru_cache(maxsize=256)
+def _normalised_call_curve(T: float, r: float, q: float, kappa: float, theta: float,
+                           v0: float, rho: float, sigma_v: float) -> CubicSpline:
+    """
+    Heston call prices for unit spot across the FFT log-strike grid
+    
+    By homogeneity C(S, K) = S * c(ln(K / S)), so one curve per maturity and
+    parameter set serves every spot and strike.
+    
+    Returns:
+        Cubic spline of c over log-moneyness ln(K / S)
+    """
+    N, eta, alpha = _FFT_N, _FFT_ETA, _FFT_ALPHA
+    lam = 2.0 * np.pi / (N * eta)
+    b = 0.5 * N * lam
+    
+    v = eta * np.arange(N)
+    k = -b + lam * np.arange(N)
+    
+    cf = _heston_cf(v - (alpha + 1.0) * 1j, T, kappa, theta, v0, rho, sigma_v, r, q)
+    psi = np.exp(-r * T) * cf / (alpha * alpha + alpha - v * v + 1j * (2.0 * alpha + 1.0) * v)
+    
+    # Simpson weights
+    weights = 3.0 + (-1.0) ** (np.arange(N) + 1)
+    weights[0] = 1.0
+    x = np.exp(1j * b * v) * psi * eta * weights / 3.0
+    
+    calls = np.exp(-alpha * k) / np.pi * np.fft.fft(x).real
+    
+    # Only the central part of the grid is accurate; +-5 in log-moneyness is ample
+    window = np.abs(k) <= 5.0
+    return CubicSpline(k[window], calls[window])
+
+
 class HestonEngine:
-    """Heston model engine (currently using Black-Scholes fallback)"""
+    """Heston stochastic volatility engine (Carr-Madan FFT)"""
     
-    def __init__(self, use_vn_config: bool = True):
-        # Fallback to Black-Scholes for now
+    def __init__(self, use_vn_config: bool = True, kappa: float = 2.0, theta: float = None,
+                 rho: float = -0.5, sigma_v: float = 0.3):
+        """
+        Initialize Heston engine
+        
+        Args:
+            use_vn_config: Use Vietnamese market configuration
+            kappa: Mean-reversion speed of the variance
+            theta: Long-run variance (defaults to the initial variance of each call)
+            rho: Spot/variance correlation
+            sigma_v: Volatility of variance
+        """
+        # Black-Scholes handles the expiry edge case
         self.pricer = BlackScholesPricer(use_vn_config=use_vn_config)
+        self.kappa = kappa
+        self.theta = theta
+        self.rho = rho
+        self.sigma_v = sigma_v
+    
+    def price_calls(self, spot_price: float, strikes, time_to_maturity: float,
+                    risk_free_rate: float, volatility: float, dividend_yield: float = 0.0) -> np.ndarray:
+        """
+        Heston call prices for a batch of strikes from one FFT
+        
+        Args:
+            spot_price: Current underlying price
+            strikes: Strike price(s)
+            time_to_maturity: Time to maturity (years)
+            risk_free_rate: Risk-free rate (annualized)
+            volatility: Current volatility; the initial variance is its square
+            dividend_yield: Dividend yield (continuous)
+        
+        Returns:
+            Call prices, one per strike
+        """
+        v0 = volatility * volatility
+        theta = self.theta if self.theta is not None else v0
+        curve = _normalised_call_curve(float(time_to_maturity), float(risk_free_rate), float(dividend_yield),
+                                       self.kappa, theta, v0, self.rho, self.sigma_v)
+        strikes = np.asarray(strikes, dtype=np.float64)
+        # The spline can undershoot zero by ~1e-7 in the far out-of-the-money tail
+        return np.maximum(spot_price * curve(np.log(strikes / spot_price)), 0.0)
+    
+    def _price(self, S: float, K: float, T: float, r: float, sigma: float, is_call: bool) -> float:
+        """Heston price of one call or put (puts through put-call parity)"""
+        call = float(self.price_calls(S, K, T, r, sigma))
+        return call if is_call else max(call - S + K * math.exp(-r * T), 0.0)
     
-    def price_warrant(self, spot_price: float, strike_price: float, 
+    def price_warrant(self, spot_price: float, strike_price: float,
                      time_to_maturity: float, risk_free_rate: float,
                      volatility: float, warrant_type: str = 'call'):
         """
-        Price a warrant using Heston model (currently Black-Scholes fallback)
+        Price a warrant using the Heston model
+        
+        Greeks use the same units as BlackScholesPricer: vega per 1% change
+        in the current volatility, theta per day, rho per 1% rate change.
         
         Returns:
             tuple: (price, greeks_dict)
         """
         option_type = 'c' if warrant_type.lower() == 'call' else 'p'
         
-        result = self.pricer.price_with_greeks(
-            S=spot_price,
-            K=strike_price,
-            T=time_to_maturity,
-            sigma=volatility,
-            r=risk_free_rate,
-            option_type=option_type
-        )
+        if time_to_maturity <= 0:
+            result = self.pricer.price_with_greeks(
+                S=spot_price,
+                K=strike_price,
+                T=time_to_maturity,
+                sigma=volatility,
+                r=risk_free_rate,
+                option_type=option_type
+            )
+            return result.price, {
+                'delta': result.delta,
+                'gamma': result.gamma,
+                'vega': result.vega,
+                'theta': result.theta,
+                'rho': result.rho
+            }
+        
+        is_call = option_type == 'c'
+        S, K, T, r, sigma = spot_price, strike_price, time_to_maturity, risk_free_rate, volatility
+        price = self._price(S, K, T, r, sigma, is_call)
+        
+        # Spot bumps reuse the cached curve for this maturity
+        dS = _SPOT_BUMP * S
+        dT = min(_DAY, 0.5 * T)
+        up = self._price(S + dS, K, T, r, sigma, is_call)
+        down = self._price(S - dS, K, T, r, sigma, is_call)
         
         greeks = {
-            'delta': result.delta,
-            'gamma': result.gamma,
-            'vega': result.vega,
-            'theta': result.theta,
-            'rho': result.rho
+            'delta': (up - down) / (2 * dS),
+            'gamma': (up - 2 * price + down) / (dS * dS),
+            'vega': (self._price(S, K, T, r, sigma + _VOL_BUMP, is_call)
+                     - self._price(S, K, T, r, sigma - _VOL_BUMP, is_call)) / (2 * _VOL_BUMP) / 100,
+            'theta': (self._price(S, K, T - dT, r, sigma, is_call) - price) / dT / 365,
+            'rho': (self._price(S, K, T, r + _RATE_BUMP, sigma, is_call)
+                    - self._price(S, K, T, r - _RATE_BUMP, sigma, is_call)) / (2 * _RATE_BUMP) / 100
         }
         
-        return result.price, greeks 
\ No newline at end of file
+        return price, greeks
+    
+    def price_warrants_batch(self, warrants: List[Dict]) -> List[tuple]:
+        """
+        Price a chain of warrants concurrently
+        
+        Warrants are independent and the numeric work runs in NumPy/SciPy
+        code that releases the GIL, so a thread pool overlaps them.
+        
+        Args:
+            warrants: Dicts of price_warrant keyword arguments, one per warrant
+        
+        Returns:
+            list: (price, greeks_dict) tuples in the order of warrants
+        """
+        if not warrants:
+            return []
+        
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(warrants))) as executor:
+            return list(executor.map(lambda kwargs: self.price_warrant(**kwargs), warrants))
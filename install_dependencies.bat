@@ -20,6 +20,10 @@ if exist requirements.txt (
         exit /b 1
     )
     echo ✅ Python dependencies installed successfully!
+    echo ⚙️ Precompiling Numba kernels (cached for later server starts^)...
+    REM Import under the services.* names the server uses, since start_system.bat runs main.py from backend;
+    REM the kernels only use the disk cache under those names
+    python -c "import services.pricing_services.black_scholes_pricer, services.hedging_services.delta_hedging_engine"
 ) else (
     echo ⚠️ requirements.txt not found, creating basic requirements...
     echo fastapi>=0.104.0 > requirements.txt